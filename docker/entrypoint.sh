@@ -6,4 +6,4 @@ echo "Mode: ${MODE}"
 echo "Kafka Bootstrap: ${KAFKA_BOOTSTRAP_SERVERS}"
 
 # Default to running the webapp
-exec python3 /app/tools/kafka_monitor_webapp.py
+exec gunicorn -c /app/tools/gunicorn_conf.py --chdir /app/tools kafka_monitor_webapp:app
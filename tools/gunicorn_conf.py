@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for the Kafka monitor webapp.
+
+All dashboard state lives in process memory, so exactly one worker runs and
+SSE clients are served from its thread pool (gthread). Async workers are not
+used: the Kafka consumer blocks inside librdkafka, which would stall an
+event loop.
+
+Usage (from the repository root):
+    gunicorn -c tools/gunicorn_conf.py --chdir tools kafka_monitor_webapp:app
+"""
+
+import os
+import sys
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5001')}"
+workers = 1
+worker_class = "gthread"
+# Each open dashboard holds one thread for its SSE stream
+threads = int(os.getenv("WEBAPP_THREADS", "64"))
+
+
+def post_worker_init(worker):
+    # Background threads must start inside the worker process, not the arbiter, and in
+    # the module gunicorn loaded (kafka_monitor_webapp or tools.kafka_monitor_webapp)
+    app = worker.app.wsgi()
+    sys.modules[app.import_name].start_background_threads()
@@ -4,16 +4,36 @@ Real-time Kafka Monitor WebApp
 Streams live data from Kafka topics and displays in a web dashboard
 """
 
-import json
 import os
+import base64
 import subprocess
 import time
 from datetime import datetime
-from collections import deque
-from threading import Thread, Lock
+from functools import lru_cache
+from collections import OrderedDict, deque
+from itertools import count
+from threading import Condition, Thread, Lock
+import numpy as np
 from flask import Flask, render_template, Response, jsonify, request
 from confluent_kafka import Consumer, KafkaError
 
+# JSON codec picked once at import: orjson when its wheel exists for this
+# platform, otherwise the stdlib (slower, and writes NaN as a bare literal)
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    import json
+
+    _loads = json.loads  # Accepts bytes directly
+
+    def _dumps_line(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8') + b"\n"
+
 # Initialize Flask app with explicit template and static paths
 app = Flask(__name__,
            template_folder='templates',
@@ -24,13 +44,15 @@ app.jinja_env.auto_reload = True
 # Data structures to hold latest state (thread-safe)
 data_lock = Lock()
 latest_prices = {}  # symbol -> price data
-price_history = {}  # symbol -> list of {tsET,o,h,l,c}
+price_history = {}  # symbol -> PriceSeries (last SERIES_CAP bars)
 latest_portfolio = {}
 latest_positions = {}  # symbol -> position data
-# Store all recent trades for the active session (unbounded list for
-# full visibility)
-recent_trades = []
-recent_trade_ids = set()  # Dedup and freeze annotations per trade
+# Store recent trades for the active session, newest first (bounded so
+# long sessions cannot grow memory without limit)
+TRADES_CAP = int(os.getenv('WEBAPP_TRADES_CAP', '5000'))
+recent_trades = deque(maxlen=TRADES_CAP)
+# Dedup and freeze annotations per trade (insertion-ordered, oldest evicted)
+recent_trade_ids = OrderedDict()
 heartbeat_status = {"status": "waiting", "lastUpdate": None}
 market_time = {"date": "", "time": "", "timestamp": ""}
 current_session_date = None  # Track current trading session date
@@ -56,12 +78,22 @@ connection_info = {
 sessions = {}  # runId -> {testDate, strategy, env, firstSeen, lastSeen}
 active_session_id = None  # Auto-follow latest runId or user-selected
 auto_follow_latest = True  # Auto-switch to newest session
-# Throughput tracking windows
-recv_times_5s = deque()
-recv_times_60s = deque()
-
-
-# Replay control state
+# Changes whenever the streamed state changes (see mark_changed)
+state_version = 0
+_state_versions = count(1)
+# Latest serialized SSE frame, shared by every unfiltered client
+frame_cond = Condition()
+latest_frame_bytes = b''
+latest_frame_version = 0
+KEEPALIVE_SECONDS = 15
+# Throughput tracking: messages received per wall-clock second, ring of 60
+sec_buckets = [0] * 60
+last_sec = 0
+
+
+# Replay control state (guarded by its own lock so replay/HTTP control
+# traffic never contends with the Kafka consumer on data_lock)
+replay_lock = Lock()
 replay_state = {
     "status": "stopped",  # stopped, starting, running, completed, error
     "selectedDate": None,
@@ -82,6 +114,132 @@ TOPICS = [
     'sentio.trades.executed.v1',
     'sentio.positions.state.v1'
 ]
+# Only these header keys are read downstream; everything else stays as bytes
+HEADER_KEYS = ("runId", "testDate", "strategy", "env", "engine")
+# Header key (str from confluent_kafka, bytes from other clients) -> the one
+# shared str used as dict key, so every decoded headers dict reuses it
+_HEADER_NAMES = {**{k: k for k in HEADER_KEYS}, **{k.encode(): k for k in HEADER_KEYS}}
+SERIES_CAP = 500  # Bars of server-side history kept per symbol
+TICK_SCALE = 100  # Series prices go over the wire as int16 cents
+MISSING_TICK = -32768
+
+
+class PriceSeries:
+    """Fixed-capacity ring buffer of OHLC bars stored column-wise"""
+    __slots__ = ('ts', 'ohlc', 'n', 'cap', '_cols', '_cols_n')
+
+    def __init__(self, cap=SERIES_CAP):
+        self.cap = cap
+        self.n = 0  # Total bars appended; the write slot is n % cap
+        self.ts = np.empty(cap, dtype=object)
+        self.ohlc = np.empty((cap, 4), dtype=np.float64)
+        self._cols = None
+        self._cols_n = -1  # Value of n that _cols was built for
+
+    def append(self, ts, o, h, l, c):
+        i = self.n % self.cap
+        self.ts[i] = ts
+        self.ohlc[i] = (o, h, l, c)  # None is stored as NaN
+        self.n += 1
+
+    def columns(self):
+        """Return bars oldest-first as {'tsET': [...], 'o': [...], 'h', 'l', 'c'}
+
+        The result is cached until the next append and shared between
+        snapshots, so callers must treat it as read-only.
+        """
+        if self._cols_n != self.n:
+            self._cols = self._build_columns()
+            self._cols_n = self.n
+        return self._cols
+
+    def _build_columns(self):
+        if self.n <= self.cap:
+            ts, ohlc = self.ts[:self.n], self.ohlc[:self.n]
+        else:
+            start = self.n % self.cap
+            ts = np.concatenate((self.ts[start:], self.ts[:start]))
+            ohlc = np.concatenate((self.ohlc[start:], self.ohlc[:start]))
+        packed = pack_ohlc(ohlc)
+        if packed is not None:
+            packed['tsET'] = ts.tolist()
+            return packed
+        o, h, l, c = ohlc.T.tolist()
+        return {'tsET': ts.tolist(), 'o': o, 'h': h, 'l': l, 'c': c}
+
+
+def pack_ohlc(ohlc):
+    """Encode OHLC rows as int16 cent offsets from the lowest price.
+
+    Returns {'base', 'scale', 'deltas'} with deltas as base64 little-endian
+    int16 in row order (o, h, l, c per bar), or None when the bars hold
+    sub-cent prices or span more than int16 ticks (callers send floats then).
+    Missing values (NaN) are sent as -32768.
+    """
+    finite = np.isfinite(ohlc)
+    if not finite.any():
+        return None
+    ticks = ohlc * TICK_SCALE
+    rounded = np.rint(ticks)
+    if np.abs(ticks - rounded)[finite].max() > 1e-6:
+        return None
+    base = rounded[finite].min()
+    deltas = rounded - base
+    if deltas[finite].max() > np.iinfo(np.int16).max:
+        return None
+    deltas[~finite] = MISSING_TICK
+    return {
+        'base': float(base) / TICK_SCALE,
+        'scale': TICK_SCALE,
+        'deltas': base64.b64encode(deltas.astype('<i2').tobytes()).decode('ascii'),
+    }
+
+
+@lru_cache(maxsize=4096)
+def parse_ts(ts):
+    """Parse an ISO timestamp (trailing 'Z' allowed); None if unparseable.
+
+    Memoized because every topic carries the same tsET within a bar.
+    """
+    if ts.endswith('Z'):
+        ts = ts[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def ts_epoch(ts):
+    """UNIX seconds for an offset-aware ISO timestamp (see parse_ts)"""
+    return parse_ts(ts).timestamp()
+
+
+@lru_cache(maxsize=4096)
+def market_clock(ts):
+    """('YYYY-MM-DD', 'HH:MM:SS') wall-clock strings of a parseable timestamp (see parse_ts)"""
+    dt = parse_ts(ts)
+    return dt.date().isoformat(), dt.time().isoformat('seconds')
+
+
+@lru_cache(maxsize=256)
+def _decode_header_value(raw):
+    return raw.decode('utf-8')
+
+
+def decode_headers(raw_headers):
+    """Extract publisher info from Kafka headers (only the keys we use).
+
+    runId/strategy/env/engine repeat on every message of a run, so decoded
+    values are memoized instead of allocating a new str per message.
+    """
+    headers = {}
+    names = _HEADER_NAMES
+    for key, value in raw_headers or ():
+        name = names.get(key)
+        if name is not None and value:
+            headers[name] = _decode_header_value(value)
+    return headers
 
 
 def kafka_consumer_thread():
@@ -102,348 +260,443 @@ def kafka_consumer_thread():
     with data_lock:
         connection_info["bootstrap"] = KAFKA_BOOTSTRAP
         connection_info["topics"] = list(TOPICS)
+        mark_changed()
 
     # Get cluster ID from broker metadata
     try:
         cluster_metadata = consumer.list_topics(timeout=5)
         with data_lock:
             connection_info["clusterId"] = cluster_metadata.cluster_id
+            mark_changed()
         print(f"[webapp] Connected to Kafka cluster: {cluster_metadata.cluster_id}", flush=True)
     except Exception as e:
         print(f"[webapp] Failed to get cluster metadata: {e}", flush=True)
 
+    batch_size = int(os.getenv('WEBAPP_BATCH', '500'))
     message_count = 0
     while True:
-        msg = consumer.poll(timeout=1.0)
-        if msg is None:
+        msgs = consumer.consume(num_messages=batch_size, timeout=1.0)
+        if not msgs:
             continue
-        if msg.error():
-            if msg.error().code() == KafkaError._PARTITION_EOF:
+
+        # Decode outside the lock; only the state mutations need it
+        batch = []
+        for msg in msgs:
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    print(f"Consumer error: {msg.error()}", flush=True)
                 continue
-            else:
-                print(f"Consumer error: {msg.error()}", flush=True)
+            try:
+                # Both codecs parse the raw bytes directly (no intermediate str decode)
+                data = _loads(msg.value())
+                headers = decode_headers(msg.headers())
+            except Exception as e:
+                print(f"Error processing message: {e}")
                 continue
+            batch.append((msg.topic(), data, headers))
+        if not batch:
+            continue
 
+        prev_count = message_count
+        message_count += len(batch)
+        throughput5s, throughput60s = record_throughput(time.time(), len(batch))
+        if prev_count == 0 or prev_count // 100 != message_count // 100:
+            print(f"[webapp] Processed {message_count} messages", flush=True)
+
+        with data_lock:
+            connection_info["throughput5s"] = throughput5s
+            connection_info["throughput60s"] = throughput60s
+            for topic, data, headers in batch:
+                try:
+                    apply_message(topic, data, headers, message_count)
+                except Exception as e:
+                    print(f"Error processing message: {e}")
+            mark_changed()
+
+
+def mark_changed():
+    """Record that the streamed state changed (safe without any lock held)"""
+    global state_version
+    # next() on itertools.count is atomic under the GIL; SSE readers only
+    # compare versions for equality, so no lock is needed here
+    state_version = next(_state_versions)
+
+
+def record_throughput(now_ts, count):
+    """Count `count` messages received at `now_ts`; return (msgs/s over 5s, over 60s)"""
+    global last_sec
+    sec = int(now_ts)
+    if sec != last_sec:
+        # Zero the slots of seconds that passed without messages
+        for i in range(min(sec - last_sec, 60)):
+            sec_buckets[(last_sec + 1 + i) % 60] = 0
+        last_sec = sec
+    sec_buckets[sec % 60] += count
+    last5 = sum(sec_buckets[(sec - i) % 60] for i in range(5))
+    return round(last5 / 5.0, 2), round(sum(sec_buckets) / 60.0, 2)
+
+
+def apply_message(topic, data, headers, message_count):
+    """Apply one decoded Kafka message to the shared state (caller holds data_lock)"""
+    global active_session_id
+    # Extract session info from headers
+    run_id = headers.get("runId")
+    test_date = headers.get("testDate") or connection_info.get("testDate", "")
+    # Mode: prefer MODE env (e.g., mock-live), else header env; normalize
+    mode_env = os.getenv("MODE")
+    header_env = headers.get("env")
+    effective = mode_env or header_env or ""
+    eff_l = effective.lower()
+    if eff_l in ("mock-live", "live"):
+        connection_info["mode"] = eff_l
+    elif effective.upper() == "MOCK":
+        connection_info["mode"] = "mock-live"
+    else:
+        connection_info["mode"] = effective
+    # Per-topic last received
+    connection_info["lastByTopic"][topic] = datetime.now().isoformat()
+    # Last message tsET per topic (if available) and latency
+    ts_et = data.get('tsET')
+    dt = parse_ts(ts_et) if isinstance(ts_et, str) and ts_et else None
+    if ts_et:
+        connection_info["lastTsETByTopic"][topic] = ts_et
+    if dt is not None and dt.tzinfo is not None:
+        # Compute latency seconds approx (now - tsET) as plain float math
+        connection_info["latencySec"] = max(0.0, time.time() - ts_epoch(ts_et))
+    # Session start/uptime
+    if run_id:
+        sess = sessions.get(run_id)
+        if sess and not sess.get("firstSeenUtc"):
+            sess["firstSeenUtc"] = datetime.now().isoformat()
+            connection_info["sessionStart"] = sess["firstSeenUtc"]
+        elif sess and sess.get("firstSeenUtc"):
+            connection_info["sessionStart"] = sess["firstSeenUtc"]
+        # uptime
         try:
-            message_count += 1
-            now_ts = time.time()
-            # Update sliding windows for throughput
-            recv_times_5s.append(now_ts)
-            recv_times_60s.append(now_ts)
-            while recv_times_5s and now_ts - recv_times_5s[0] > 5:
-                recv_times_5s.popleft()
-            while recv_times_60s and now_ts - recv_times_60s[0] > 60:
-                recv_times_60s.popleft()
-            if message_count == 1 or message_count % 100 == 0:
-                print(f"[webapp] Processed {message_count} messages", flush=True)
-
-            topic = msg.topic()
-            data = json.loads(msg.value().decode('utf-8'))
-
-            # Extract publisher info from headers
-            headers = {}
-            if msg.headers():
-                for key, value in msg.headers():
-                    if value:
-                        headers[key] = value.decode('utf-8')
+            if connection_info["sessionStart"]:
+                start_dt = parse_ts(connection_info["sessionStart"])
+                connection_info["uptimeSec"] = int((datetime.now() - start_dt).total_seconds())
+        except Exception:
+            pass
+
+    # Track session
+    if run_id:
+        now = datetime.now().isoformat()
+        if run_id not in sessions:
+            sessions[run_id] = {
+                "runId": run_id,
+                "testDate": test_date,
+                "strategy": headers.get("strategy"),
+                "env": headers.get("env"),
+                "firstSeen": now,
+                "lastSeen": now
+            }
+            print(f"[webapp] New session detected: {run_id} (testDate={test_date})", flush=True)
+        else:
+            sessions[run_id]["lastSeen"] = now
+
+        # Auto-follow latest session
+        if auto_follow_latest:
+            if active_session_id != run_id:
+                print(f"[webapp] Switching to session: {run_id} (testDate={test_date})", flush=True)
+                # Clear data when switching sessions
+                latest_prices.clear()
+                latest_positions.clear()
+                recent_trades.clear()
+                price_history.clear()  # Also clear historical bars
+                active_session_id = run_id
+
+        # Filter: Skip messages from inactive sessions
+        if run_id != active_session_id:
+            return
+
+    # Update connection info with publisher metadata
+    connection_info["messageCount"] = message_count
+    if headers:
+        for key in ["strategy", "env", "runId", "engine"]:
+            if key in headers:
+                connection_info["publisher"][key] = headers[key]
+    # Update market time from any message with timestamp
+    if dt is not None:
+        market_date, market_clock_time = market_clock(ts_et)
+        market_time.update({
+            'date': market_date,
+            'time': market_clock_time,
+            'timestamp': ts_et
+        })
+
+    handler = HANDLERS.get(topic)
+    if handler:
+        handler(data, headers)
+
+
+def _to_float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _handle_price(data, headers):
+    get = data.get  # Bound once; prices are the highest-volume topic
+    symbol = get('symbol')
+    if not symbol:
+        return
+    ts, o, h, l, c = get('tsET', ''), get('open', 0), get('high', 0), get('low', 0), get('close', 0)
+    entry = {
+        'symbol': symbol,
+        'open': o,
+        'high': h,
+        'low': l,
+        'close': c,
+        'volume': get('volume', 0),
+        'timestamp': ts
+    }
+    # Optional annotation field
+    ann = get('annotation')
+    if ann:
+        entry['annotation'] = ann
+    sig = get('signal')
+    if sig:
+        entry['signal'] = {
+            'probability': sig.get('probability'),
+            'confidence': sig.get('confidence'),
+            'detectors': sig.get('detectors', {})
+        }
+    latest_prices[symbol] = entry
+
+    # Append to server-side history (keep last SERIES_CAP points per symbol)
+    hist = price_history.get(symbol)
+    if hist is None:
+        hist = price_history[symbol] = PriceSeries()
+    hist.append(ts, o, h, l, c)
+
+
+def _handle_portfolio(data, headers):
+    equity = data.get('equity', 0)
+    total_pnl = data.get('totalPnl', 0)
+    total_pnl_pct = data.get('totalPnlPct', 0)
+    latest_portfolio.update({
+        'equity': equity,
+        'cash': data.get('cash', 0),
+        'positions': data.get('positions', 0),
+        'totalPnl': total_pnl,
+        'totalPnlPct': total_pnl_pct,
+        'timestamp': data.get('tsET', ''),
+        # Aliases for original template
+        'totalValue': equity,
+        'dailyPnL': total_pnl,
+        'dailyPnLPercent': _to_float(total_pnl_pct) * 100.0
+    })
 
-            with data_lock:
-                # Extract session info from headers
-                run_id = headers.get("runId")
-                test_date = headers.get("testDate") or connection_info.get("testDate", "")
-                # Mode: prefer MODE env (e.g., mock-live), else header env; normalize
-                mode_env = os.getenv("MODE")
-                header_env = headers.get("env")
-                effective = mode_env or header_env or ""
-                eff_l = effective.lower()
-                if eff_l in ("mock-live", "live"):
-                    connection_info["mode"] = eff_l
-                elif effective.upper() == "MOCK":
-                    connection_info["mode"] = "mock-live"
-                else:
-                    connection_info["mode"] = effective
-                # Per-topic last received
-                connection_info["lastByTopic"][topic] = datetime.now().isoformat()
-                # Last message tsET per topic (if available) and latency
-                ts_et = data.get('tsET')
-                if ts_et:
-                    connection_info["lastTsETByTopic"][topic] = ts_et
-                    try:
-                        # Compute latency seconds approx (now - tsET)
-                        dt = datetime.fromisoformat(ts_et.replace('Z', '+00:00'))
-                        connection_info["latencySec"] = max(0.0, (datetime.now().astimezone(dt.tzinfo) - dt).total_seconds())
-                    except Exception:
-                        pass
-                # Throughput
-                connection_info["throughput5s"] = round(len(recv_times_5s) / 5.0, 2)
-                connection_info["throughput60s"] = round(len(recv_times_60s) / 60.0, 2)
-                # Session start/uptime
-                global current_session_date
-                if run_id:
-                    sess = sessions.get(run_id)
-                    if sess and not sess.get("firstSeenUtc"):
-                        sess["firstSeenUtc"] = datetime.now().isoformat()
-                        connection_info["sessionStart"] = sess["firstSeenUtc"]
-                    elif sess and sess.get("firstSeenUtc"):
-                        connection_info["sessionStart"] = sess["firstSeenUtc"]
-                    # uptime
-                    try:
-                        if connection_info["sessionStart"]:
-                            start_dt = datetime.fromisoformat(connection_info["sessionStart"])
-                            connection_info["uptimeSec"] = int((datetime.now() - start_dt).total_seconds())
-                    except Exception:
-                        pass
-
-                # Track session
-                if run_id:
-                    now = datetime.now().isoformat()
-                    if run_id not in sessions:
-                        sessions[run_id] = {
-                            "runId": run_id,
-                            "testDate": test_date,
-                            "strategy": headers.get("strategy"),
-                            "env": headers.get("env"),
-                            "firstSeen": now,
-                            "lastSeen": now
-                        }
-                        print(f"[webapp] New session detected: {run_id} (testDate={test_date})", flush=True)
-                    else:
-                        sessions[run_id]["lastSeen"] = now
-
-                    # Auto-follow latest session
-                    global active_session_id, auto_follow_latest
-                    if auto_follow_latest:
-                        if active_session_id != run_id:
-                            print(f"[webapp] Switching to session: {run_id} (testDate={test_date})", flush=True)
-                            # Clear data when switching sessions
-                            latest_prices.clear()
-                            latest_positions.clear()
-                            recent_trades.clear()
-                            price_history.clear()  # Also clear historical bars
-                            active_session_id = run_id
-
-                    # Filter: Skip messages from inactive sessions
-                    if run_id != active_session_id:
-                        continue
-
-                # Update connection info with publisher metadata
-                connection_info["messageCount"] = message_count
-                if headers:
-                    for key in ["strategy", "env", "runId", "engine"]:
-                        if key in headers:
-                            connection_info["publisher"][key] = headers[key]
-                # Update market time from any message with timestamp
-                ts = data.get('tsET', '')
-                if ts:
-                    try:
-                        dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                        new_date = dt.strftime('%Y-%m-%d')
-                        market_time.update({
-                            'date': new_date,
-                            'time': dt.strftime('%H:%M:%S'),
-                            'timestamp': ts
-                        })
-                    except:
-                        pass
-
-                if topic == 'sentio.prices.minute.v1':
-                    symbol = data.get('symbol')
-                    if symbol:
-                        entry = {
-                            'symbol': symbol,
-                            'open': data.get('open', 0),
-                            'high': data.get('high', 0),
-                            'low': data.get('low', 0),
-                            'close': data.get('close', 0),
-                            'volume': data.get('volume', 0),
-                            'timestamp': data.get('tsET', '')
-                        }
-                        # Optional annotation field
-                        ann = data.get('annotation')
-                        if ann:
-                            entry['annotation'] = ann
-                        sig = data.get('signal') or {}
-                        if sig:
-                            entry['signal'] = {
-                                'probability': sig.get('probability'),
-                                'confidence': sig.get('confidence'),
-                                'detectors': sig.get('detectors', {})
-                            }
-                        latest_prices[symbol] = entry
-
-                        # Append to server-side history (keep last ~500 points per symbol)
-                        hist = price_history.get(symbol, [])
-                        hist.append({
-                            'tsET': entry['timestamp'],
-                            'o': entry['open'],
-                            'h': entry['high'],
-                            'l': entry['low'],
-                            'c': entry['close']
-                        })
-                        if len(hist) > 500:
-                            hist = hist[-500:]
-                        price_history[symbol] = hist
-
-                elif topic == 'sentio.portfolio.minute.v1':
-                    latest_portfolio.update({
-                        'equity': data.get('equity', 0),
-                        'cash': data.get('cash', 0),
-                        'positions': data.get('positions', 0),
-                        'totalPnl': data.get('totalPnl', 0),
-                        'totalPnlPct': data.get('totalPnlPct', 0),
-                        'timestamp': data.get('tsET', '')
-                    })
-
-                elif topic == 'sentio.positions.state.v1':
-                    symbol = data.get('symbol')
-                    if symbol and data.get('hasPosition'):
-                        latest_positions[symbol] = {
-                            'symbol': symbol,
-                            'hasPosition': True,  # Required by front-end
-                            'shares': data.get('shares', 0),
-                            'entryPrice': data.get('entryPrice', 0),
-                            'marketPrice': data.get('marketPrice', 0),
-                            'unrealizedPnl': data.get('unrealizedPnl', 0),
-                            'unrealizedPnlPct': data.get('unrealizedPnlPct', 0),
-                            'barsHeld': data.get('barsHeld', 0),
-                            'timestamp': data.get('tsET', ''),
-                            'annotation': data.get('annotation', '')
-                        }
-                    elif symbol and not data.get('hasPosition'):
-                        # Position closed
-                        latest_positions.pop(symbol, None)
-
-                elif topic == 'sentio.trades.executed.v1':
-                    tid = data.get('tradeId', '')
-                    if tid and tid in recent_trade_ids:
-                        # Ignore duplicates/updates; keep original annotation
-                        pass
-                    else:
-                        recent_trade_ids.add(tid)
-                        # Prefer event-specific annotation if provided by producer
-                        event_annotation = data.get('eventAnnotation') or data.get('annotation') or data.get('reason', '')
-                        # Insert newest at the front to maintain reverse-chronological order
-                        recent_trades.insert(0, {
-                            'tradeId': tid,
-                            'symbol': data.get('symbol', ''),
-                            'action': data.get('action', ''),
-                            'price': data.get('price', 0),
-                            'shares': data.get('shares', 0),
-                            'value': data.get('value', 0),
-                            'pnl': data.get('pnl', 0),
-                            'pnlPct': data.get('pnlPct', 0),
-                            'reason': data.get('reason', ''),
-                            'annotation_fixed': event_annotation,
-                            'barsHeld': data.get('barsHeld', 0),
-                            'timestamp': data.get('tsET', '')
-                        })
-
-                elif topic == 'sentio.heartbeat.v1':
-                    heartbeat_status.update({
-                        'status': data.get('status', 'unknown'),
-                        'lastUpdate': datetime.now().isoformat()
-                    })
 
-        except Exception as e:
-            print(f"Error processing message: {e}")
+def _handle_position(data, headers):
+    get = data.get
+    symbol = get('symbol')
+    if not symbol:
+        return
+    if not get('hasPosition'):
+        # Position closed
+        latest_positions.pop(symbol, None)
+        return
+    market_price = get('marketPrice', 0)
+    unrealized = get('unrealizedPnl', 0)
+    unrealized_pct = get('unrealizedPnlPct', 0)
+    latest_positions[symbol] = {
+        'symbol': symbol,
+        'hasPosition': True,  # Required by front-end
+        'shares': get('shares', 0),
+        'entryPrice': get('entryPrice', 0),
+        'marketPrice': market_price,
+        'unrealizedPnl': unrealized,
+        'unrealizedPnlPct': unrealized_pct,
+        'barsHeld': get('barsHeld', 0),
+        'timestamp': get('tsET', ''),
+        'annotation': get('annotation', ''),
+        # Aliases for original template
+        'currentPrice': market_price,
+        'unrealizedPnL': unrealized,
+        'unrealizedPnLPercent': _to_float(unrealized_pct) * 100.0
+    }
+
+
+def _handle_trade(data, headers):
+    get = data.get
+    tid = get('tradeId', '')
+    if tid and tid in recent_trade_ids:
+        # Ignore duplicates/updates; keep original annotation
+        return
+    recent_trade_ids[tid] = None
+    if len(recent_trade_ids) > TRADES_CAP:
+        recent_trade_ids.popitem(last=False)
+    # Prefer event-specific annotation if provided by producer
+    event_annotation = get('eventAnnotation') or get('annotation') or get('reason', '')
+    pnl = get('pnl', 0)
+    trade = {
+        'tradeId': tid,
+        'symbol': get('symbol', ''),
+        'action': get('action', ''),
+        'price': get('price', 0),
+        'shares': get('shares', 0),
+        'value': get('value', 0),
+        'pnl': pnl,
+        'pnlPct': get('pnlPct', 0),
+        'reason': get('reason', ''),
+        'annotation_fixed': event_annotation,
+        'barsHeld': get('barsHeld', 0),
+        'timestamp': get('tsET', ''),
+        # Frozen annotation and alias expected by original template
+        'annotation': event_annotation,
+        'realizedPnL': _to_float(pnl)
+    }
+    # Refine generic 'rotation' reasons into more meaningful ones
+    trade['reason'] = classify_reason(trade)
+    # Insert newest at the front to maintain reverse-chronological order
+    recent_trades.appendleft(trade)
+
+
+def _handle_heartbeat(data, headers):
+    heartbeat_status.update({
+        'status': data.get('status', 'unknown'),
+        'lastUpdate': datetime.now().isoformat()
+    })
+
 
+# Topic -> handler(data, headers); handlers run with data_lock already held
+HANDLERS = {
+    'sentio.prices.minute.v1': _handle_price,
+    'sentio.portfolio.minute.v1': _handle_portfolio,
+    'sentio.positions.state.v1': _handle_position,
+    'sentio.trades.executed.v1': _handle_trade,
+    'sentio.heartbeat.v1': _handle_heartbeat,
+}
+
+
+def encode_frame(state, version):
+    """Serialize a state snapshot as one SSE frame whose `id:` is its state version"""
+    # EventSource echoes the id back as Last-Event-ID when it reconnects;
+    # _dumps_line returns bytes ending in the newline that closes the data line
+    return b"id: %d\ndata: " % version + _dumps_line(state) + b"\n"
 
-def event_stream():
-    """Server-Sent Events stream"""
+
+def frame_builder_thread():
+    """Background thread that serializes the state once per change for all SSE clients"""
+    global latest_frame_bytes, latest_frame_version
     last_log_time = 0
     last_cleanup_time = 0
+    built_version = None
     SESSION_TIMEOUT_SECONDS = 300  # 5 minutes
 
+    while True:
+        # A failing tick is logged and retried on the next one; built_version only
+        # advances after a frame is published, so no change is skipped
+        try:
+            with data_lock:
+                # Log position state every 10 seconds for debugging
+                current_time = time.time()
+                if current_time - last_log_time > 10:
+                    print(f"[webapp] DEBUG: latest_positions has {len(latest_positions)} entries: {list(latest_positions.keys())}", flush=True)
+                    last_log_time = current_time
+
+                # Cleanup stale sessions every 60 seconds (a failing cleanup waits for the next round)
+                if current_time - last_cleanup_time > 60:
+                    last_cleanup_time = current_time
+                    now = datetime.now()
+                    stale_sessions = []
+                    for run_id, session in sessions.items():
+                        last_seen = datetime.fromisoformat(session["lastSeen"])
+                        age_seconds = (now - last_seen).total_seconds()
+                        if age_seconds > SESSION_TIMEOUT_SECONDS:
+                            stale_sessions.append(run_id)
+
+                    for run_id in stale_sessions:
+                        test_date = sessions[run_id].get("testDate", "unknown")
+                        print(f"[webapp] Cleaning up stale session: {run_id} (testDate={test_date}, age={int(age_seconds/60)}min)", flush=True)
+                        del sessions[run_id]
+
+                    if stale_sessions:
+                        mark_changed()
+                        print(f"[webapp] Cleaned up {len(stale_sessions)} stale sessions. Active sessions: {len(sessions)}", flush=True)
+
+                # Only rebuild the snapshot when something changed since the last frame
+                version = state_version
+                state = snapshot_state() if version != built_version else None
+
+            if state is not None:
+                frame = encode_frame(state, version)
+                with frame_cond:
+                    latest_frame_bytes = frame
+                    latest_frame_version = version
+                    frame_cond.notify_all()
+                built_version = version
+        except Exception as e:
+            print(f"[webapp] Frame builder error: {e}", flush=True)
+        time.sleep(1)  # Update every second
+
+
+def event_stream(symbols=None, since=None):
+    """Server-Sent Events stream.
+
+    Unfiltered clients share the frame published by frame_builder_thread;
+    `since` (the client's last frame id) skips the frame it already has. Clients that
+    restrict the series to `symbols` get their own snapshot per change.
+    """
+    last_sent_version = since
+    if symbols is None:
+        while True:
+            with frame_cond:
+                # Block until a new frame exists (or the keepalive interval passes),
+                # including before the builder's first publish
+                while not latest_frame_bytes or latest_frame_version == last_sent_version:
+                    if not frame_cond.wait(timeout=KEEPALIVE_SECONDS):
+                        break
+                frame, version = latest_frame_bytes, latest_frame_version
+            if not frame or version == last_sent_version:
+                yield b": ka\n\n"  # SSE comment keepalive; ignored by EventSource
+            else:
+                last_sent_version = version
+                yield frame
+
     while True:
         with data_lock:
-            # Log position state every 10 seconds for debugging
-            current_time = time.time()
-            if current_time - last_log_time > 10:
-                print(f"[webapp] DEBUG: latest_positions has {len(latest_positions)} entries: {list(latest_positions.keys())}", flush=True)
-                last_log_time = current_time
-
-            # Cleanup stale sessions every 60 seconds
-            if current_time - last_cleanup_time > 60:
-                now = datetime.now()
-                stale_sessions = []
-                for run_id, session in sessions.items():
-                    last_seen = datetime.fromisoformat(session["lastSeen"])
-                    age_seconds = (now - last_seen).total_seconds()
-                    if age_seconds > SESSION_TIMEOUT_SECONDS:
-                        stale_sessions.append(run_id)
-
-                for run_id in stale_sessions:
-                    test_date = sessions[run_id].get("testDate", "unknown")
-                    print(f"[webapp] Cleaning up stale session: {run_id} (testDate={test_date}, age={int(age_seconds/60)}min)", flush=True)
-                    del sessions[run_id]
-
-                if stale_sessions:
-                    print(f"[webapp] Cleaned up {len(stale_sessions)} stale sessions. Active sessions: {len(sessions)}", flush=True)
-
-                last_cleanup_time = current_time
-
-            # Freeze trade annotations (map annotation_fixed -> annotation)
-            frozen_trades = []
-            for t in list(recent_trades):
-                tt = dict(t)
-                if 'annotation' not in tt:
-                    tt['annotation'] = tt.get('annotation_fixed', '')
-                # Provide alias expected by original template
-                if 'pnl' in tt and 'realizedPnL' not in tt:
-                    try:
-                        tt['realizedPnL'] = float(tt.get('pnl', 0))
-                    except Exception:
-                        tt['realizedPnL'] = 0.0
-                # Refine generic 'rotation' reasons into more meaningful
-                tt['reason'] = classify_reason(tt)
-                frozen_trades.append(tt)
-
-            # Portfolio aliases for original template
-            portfolio_out = dict(latest_portfolio)
-            if 'equity' in latest_portfolio:
-                portfolio_out['totalValue'] = latest_portfolio.get('equity', 0)
-            if 'totalPnl' in latest_portfolio:
-                portfolio_out['dailyPnL'] = latest_portfolio.get('totalPnl', 0)
-            if 'totalPnlPct' in latest_portfolio:
-                try:
-                    portfolio_out['dailyPnLPercent'] = float(latest_portfolio.get('totalPnlPct', 0)) * 100.0
-                except Exception:
-                    portfolio_out['dailyPnLPercent'] = 0.0
-
-            # Positions aliases for original template
-            positions_out = []
-            for p in list(latest_positions.values()):
-                q = dict(p)
-                if 'marketPrice' in p:
-                    q['currentPrice'] = p.get('marketPrice', 0)
-                if 'unrealizedPnl' in p and 'unrealizedPnL' not in p:
-                    q['unrealizedPnL'] = p.get('unrealizedPnl', 0)
-                if 'unrealizedPnlPct' in p and 'unrealizedPnLPercent' not in p:
-                    try:
-                        q['unrealizedPnLPercent'] = float(p.get('unrealizedPnlPct', 0)) * 100.0
-                    except Exception:
-                        q['unrealizedPnLPercent'] = 0.0
-                positions_out.append(q)
-
-            state = {
-                'prices': list(latest_prices.values()),
-                'series': price_history,
-                'portfolio': portfolio_out,
-                'positions': positions_out,
-                'trades': frozen_trades,
-                'heartbeat': heartbeat_status,
-                'marketTime': market_time,
-                'connection': connection_info,
-                'sessions': list(sessions.values()),
-                'activeSessionId': active_session_id,
-                'autoFollowLatest': auto_follow_latest,
-                'replayState': dict(replay_state)
-            }
+            state = None
+            if state_version != last_sent_version:
+                last_sent_version = state_version
+                state = snapshot_state(symbols)
 
-        yield f"data: {json.dumps(state)}\n\n"
+        if state is None:
+            yield b": ka\n\n"
+        else:
+            yield encode_frame(state, last_sent_version)
         time.sleep(1)  # Update every second
 
 
+def snapshot_state(symbols=None):
+    """Build the SSE state payload from the shared state (caller holds data_lock)"""
+    # Records are enriched once at ingest and replaced, never mutated, so a
+    # shallow copy of each container the consumer mutates in place is enough
+    # for serialization to run without holding the lock. Series columns are
+    # cached per symbol and only rebuilt for symbols that got a new bar.
+    connection_out = dict(connection_info)
+    for key in ("publisher", "lastByTopic", "lastTsETByTopic"):
+        connection_out[key] = dict(connection_info[key])
+    return {
+        'prices': list(latest_prices.values()),
+        'series': {sym: hist.columns() for sym, hist in price_history.items()
+                   if symbols is None or sym in symbols},
+        'portfolio': dict(latest_portfolio),
+        'positions': list(latest_positions.values()),
+        'trades': list(recent_trades),
+        'heartbeat': dict(heartbeat_status),
+        'marketTime': dict(market_time),
+        'connection': connection_out,
+        'sessions': [dict(sess) for sess in sessions.values()],
+        'activeSessionId': active_session_id,
+        'autoFollowLatest': auto_follow_latest,
+        'replayState': replay_snapshot()
+    }
+
+
 def classify_reason(trade: dict) -> str:
     """Return a more meaningful reason label based on trade context.
 
@@ -492,7 +745,15 @@ def index():
 
 @app.route('/stream')
 def stream():
-    response = Response(event_stream(), mimetype='text/event-stream')
+    # Optional ?symbols=AAA,BBB restricts the (large) per-symbol series payload
+    symbols = request.args.get('symbols')
+    symbols = set(symbols.upper().split(',')) if symbols else None
+    # ?since=<version>, or the Last-Event-ID EventSource sends on reconnect,
+    # skips a frame the client already has
+    since = request.args.get('since', type=int)
+    if since is None:
+        since = request.headers.get('Last-Event-ID', type=int)
+    response = Response(event_stream(symbols, since), mimetype='text/event-stream')
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     response.headers['X-Accel-Buffering'] = 'no'
     return response
@@ -513,6 +774,7 @@ def switch_session(session_id):
             latest_portfolio.clear()
             recent_trades.clear()
             price_history.clear()  # Also clear historical bars
+            mark_changed()
             return {"status": "success", "activeSessionId": active_session_id}
         else:
             return {"status": "error", "message": "Session not found"}, 404
@@ -524,57 +786,66 @@ def enable_auto_follow():
     global auto_follow_latest
     with data_lock:
         auto_follow_latest = True
+        mark_changed()
         print("[webapp] Auto-follow enabled", flush=True)
         return {"status": "success", "autoFollowLatest": True}
 
 
 # ===== REPLAY CONTROL FUNCTIONS =====
 
-def get_available_dates():
-    """Get available trading dates from market_data_manager.py"""
-    try:
-        result = subprocess.run(
-            ["python3", "tools/market_data_manager.py", "--list-dates"],
-            cwd="/Volumes/MyBookDuo/Projects/sentio_lite",
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+DATES_TTL_SECONDS = 30
+_dates_cache = {"dates": [], "expires": 0.0}
 
-        if result.returncode != 0:
-            print(f"[webapp] Error getting dates: {result.stderr}", flush=True)
-            return []
 
-        # Parse output - one date per line
-        dates = []
-        for line in result.stdout.strip().split('\n'):
-            line = line.strip()
-            # Skip non-date lines (like the "Existing data loaded" message)
-            if line and line.startswith('2025-'):
-                dates.append(line)
-
-        # Skip first day (need previous day for warmup)
-        return dates[1:] if dates else []
+def get_available_dates():
+    """Get available trading dates from the market data database (cached briefly)"""
+    now = time.monotonic()
+    if now < _dates_cache["expires"]:
+        return _dates_cache["dates"]
+    try:
+        # Imported lazily: pulls in pandas + market calendars on first use only.
+        # tools/ is on sys.path when run as a script, the project root under
+        # `gunicorn tools.kafka_monitor_webapp:app`
+        try:
+            from market_data_manager import list_available_dates
+        except ModuleNotFoundError as e:
+            if e.name != "market_data_manager":
+                raise
+            from tools.market_data_manager import list_available_dates
+        dates = list_available_dates(os.path.join(PROJECT_ROOT, "data/equities"))
     except Exception as e:
         print(f"[webapp] Error getting dates: {e}", flush=True)
         return []
 
+    # Skip first day (need previous day for warmup)
+    dates = dates[1:] if dates else []
+    _dates_cache.update({"dates": dates, "expires": now + DATES_TTL_SECONDS})
+    return dates
+
+
+def replay_snapshot():
+    """Return a copy of the replay control state"""
+    with replay_lock:
+        return dict(replay_state)
+
 
 def start_replay_background(test_date):
     """Start replay for the selected test date (runs in background thread)"""
     global replay_process
 
-    with data_lock:
+    with replay_lock:
         replay_state["status"] = "starting"
         replay_state["selectedDate"] = test_date
         replay_state["error"] = None
 
+    with data_lock:
         # Clear previous data
         latest_prices.clear()
         latest_portfolio.clear()
         latest_positions.clear()
         recent_trades.clear()
         market_time.clear()
+        mark_changed()
 
     print(f"[webapp] Starting replay for {test_date}", flush=True)
 
@@ -606,20 +877,23 @@ def start_replay_background(test_date):
             stderr=subprocess.PIPE
         )
 
-        with data_lock:
+        with replay_lock:
             replay_state["status"] = "running"
+            mark_changed()
 
         # Monitor completion
         replay_process.wait()
-        with data_lock:
+        with replay_lock:
             if replay_state["status"] == "running":
                 replay_state["status"] = "completed"
+                mark_changed()
                 print(f"[webapp] Replay completed for {test_date}", flush=True)
 
     except Exception as e:
-        with data_lock:
+        with replay_lock:
             replay_state["status"] = "error"
             replay_state["error"] = str(e)
+            mark_changed()
         print(f"[webapp] Error in replay: {e}", flush=True)
 
 
@@ -627,8 +901,9 @@ def stop_replay_background():
     """Stop the current replay (runs in background thread)"""
     global replay_process
 
-    with data_lock:
+    with replay_lock:
         replay_state["status"] = "stopped"
+        mark_changed()
 
     print("[webapp] Stopping replay", flush=True)
 
@@ -652,8 +927,11 @@ def stop_replay_background():
 def api_replay_dates():
     """Get available trading dates"""
     dates = get_available_dates()
-    with data_lock:
-        replay_state["availableDates"] = dates
+    with replay_lock:
+        # Polls usually return the same list; only a change is worth a new frame
+        if replay_state["availableDates"] != dates:
+            replay_state["availableDates"] = dates
+            mark_changed()
     return jsonify({"dates": dates})
 
 
@@ -666,7 +944,7 @@ def api_replay_start():
     if not test_date:
         return jsonify({"error": "No test date provided"}), 400
 
-    with data_lock:
+    with replay_lock:
         if replay_state["status"] in ["starting", "running"]:
             return jsonify({"error": "Replay already running"}), 400
 
@@ -686,16 +964,36 @@ def api_replay_stop():
 @app.route('/api/replay/state')
 def api_replay_state():
     """Get current replay state"""
-    with data_lock:
-        return jsonify(dict(replay_state))
+    return jsonify(replay_snapshot())
+
+
+_background_threads = []
+_background_start_lock = Lock()
+
+
+def start_background_threads():
+    """Start the Kafka consumer and SSE frame builder once per process"""
+    with _background_start_lock:
+        if not _background_threads:
+            for target in (kafka_consumer_thread, frame_builder_thread):
+                thread = Thread(target=target, daemon=True)
+                thread.start()
+                _background_threads.append(thread)
+
+
+@app.before_request
+def _ensure_background_threads():
+    # Servers started without gunicorn_conf.py's post_worker_init get them on first request
+    if not _background_threads:
+        start_background_threads()
 
 
 if __name__ == '__main__':
-    # Start Kafka consumer in background thread
-    consumer_thread = Thread(target=kafka_consumer_thread, daemon=True)
-    consumer_thread.start()
+    # Start Kafka consumer and frame builder in background threads
+    start_background_threads()
 
     print("Starting Kafka Monitor WebApp...")
     print("Open http://localhost:5001 in your browser")
+    print("(development server; use gunicorn -c tools/gunicorn_conf.py for deployments)")
 
     app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
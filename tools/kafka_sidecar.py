@@ -65,7 +65,8 @@ def load_symbols_from_conf(conf_path: str = "config/symbols.conf") -> List[str]:
                 symbols.append(line.upper())
     except Exception:
         return []
-    return symbols
+    # Subscribe once per symbol, in the order symbols.conf lists them
+    return list(dict.fromkeys(symbols))
 
 try:
     from polygon import WebSocketClient
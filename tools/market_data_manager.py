@@ -12,6 +12,10 @@ A comprehensive tool for managing historical market data with the following guar
 This is a read-only database that keeps expanding as new market data becomes available
 or historical data is backfilled for research purposes.
 
+Storage: each symbol is kept as <SYMBOL>_RTH_NH.parquet (ZSTD) plus the
+C++ compatible <SYMBOL>_RTH_NH.bin. Legacy .csv files are still read and can
+be converted in place with --migrate-parquet.
+
 Usage:
     # Download new data (appends to existing)
     python3 market_data_manager.py --symbols TQQQ SQQQ --start 2025-10-20 --end 2025-10-24
@@ -24,18 +28,41 @@ Usage:
 
     # List all symbols in database
     python3 market_data_manager.py --list
+
+    # Convert legacy CSV files to Parquet
+    python3 market_data_manager.py --migrate-parquet
 """
 
 import os
+import re
+import sys
+import json
+import mmap
 import argparse
 import requests
+import numpy as np
 import pandas as pd
 import pandas_market_calendars as mcal
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
 import struct
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from threading import BoundedSemaphore, Lock, RLock
 from typing import Optional, Tuple, List, Dict
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # === Constants ===
 RTH_START = "09:30"
 RTH_END = "16:00"
@@ -43,6 +70,165 @@ NY_TIMEZONE = "America/New_York"
 POLYGON_API_BASE = "https://api.polygon.io"
 BARS_PER_DAY = 391  # 9:30 AM to 4:00 PM = 390 minutes + 1 initial bar
 FILE_SUFFIX = "_RTH_NH"  # Regular Trading Hours, No Holidays
+BAR_COLUMNS = ['ts_epoch_utc', 'open', 'high', 'low', 'close', 'volume']
+DATA_COLUMNS = ['ts_utc'] + BAR_COLUMNS  # ts_utc is derived; readers rebuild it from ts_epoch_utc
+# Explicit legacy CSV column types, so the reader never infers them
+CSV_COLUMN_TYPES = {'ts_utc': pa.string(), 'ts_epoch_utc': pa.int64(), 'open': pa.float64(),
+                    'high': pa.float64(), 'low': pa.float64(), 'close': pa.float64(),
+                    'volume': pa.float64()}
+PARQUET_ROW_GROUP = BARS_PER_DAY * 20  # ~one trading month per row group
+# Polygon aggregate fields ('t', 'o', ...) mapped to our column names, with fixed dtypes
+POLYGON_BAR_FIELDS = [('t', 'timestamp_utc_ms'), ('o', 'open'), ('h', 'high'),
+                      ('l', 'low'), ('c', 'close'), ('v', 'volume')]
+POLYGON_BAR_DTYPE = np.dtype([('timestamp_utc_ms', '<i8'), ('open', '<f8'), ('high', '<f8'),
+                              ('low', '<f8'), ('close', '<f8'), ('volume', '<f8')])
+FETCH_WORKERS = 8  # Polygon requests in flight at once, across all symbols (--fetch-workers)
+UPDATE_WORKERS = 4  # Symbols updated concurrently; they share the FETCH_WORKERS request slots
+FETCH_RETRIES = 5  # Retries of an HTTP 429 response before the shard fails
+MM_DD_PATTERN = re.compile(r'\d{2}-\d{2}')  # --start/--end shorthand for the current year
+MANIFEST_NAME = ".manifest.json"  # Cached per-symbol stats, keyed by data file size/mtime
+SANITY_POOL_MIN_SCANS = 16  # Stale/missing manifest entries before sanity_check uses processes
+
+# One .bin bar record when the timestamp string has the usual fixed width
+# ("2025-10-27T09:30:00-04:00"): u32 length, ts bytes, then '<qddddQ'
+TS_STR_LEN = 25
+BIN_RECORD_DTYPE = np.dtype([
+    ('ts_len', '<u4'),
+    ('ts_utc', f'S{TS_STR_LEN}'),
+    ('ts_epoch_utc', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<u8'),
+])
+
+
+def _format_ts_strings(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Formats a tz-aware index as '%Y-%m-%dT%H:%M:%S+HH:MM' strings (ts_utc column).
+    The offset suffix is built once per distinct UTC offset (EST/EDT), not per bar.
+    """
+    wall = index.tz_localize(None).values
+    offset_min = (wall.view('i8') - index.asi8) // (60 * 10**9)
+    offsets, which = np.unique(offset_min, return_inverse=True)
+    suffixes = np.array(
+        [f"{'+' if m >= 0 else '-'}{abs(m) // 60:02d}:{abs(m) % 60:02d}" for m in offsets],
+        dtype='U6'
+    )
+    return np.char.add(np.datetime_as_string(wall, unit='s'), suffixes[which])
+
+
+def _ny_index(epoch_ns: np.ndarray, name: Optional[str] = None) -> pd.DatetimeIndex:
+    """New York DatetimeIndex over int64 UTC epoch nanoseconds (a view, no parsing)."""
+    utc = pd.DatetimeIndex(epoch_ns.astype('int64', copy=False).view('datetime64[ns]'), tz='UTC', name=name)
+    return utc.tz_convert(NY_TIMEZONE)
+
+
+def _month_shards(start_date: str, end_date: str) -> List[Tuple[str, str]]:
+    """Splits an inclusive YYYY-MM-DD range into per-calendar-month (start, end) pairs."""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    shards = []
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        shard_end = min(end, next_month - timedelta(days=1))
+        shards.append((start.isoformat(), shard_end.isoformat()))
+        start = next_month
+    return shards
+
+
+def _epoch_stats(epochs: np.ndarray) -> Dict:
+    """
+    Bar count, date range and days with a wrong bar count from sorted UTC epoch seconds.
+    RTH bars (13:30-21:00 UTC) never cross a UTC midnight, so the UTC day is the ET day.
+    bad_days holds [date, bars, first_epoch, last_epoch] lists (JSON-friendly).
+    """
+    bars = len(epochs)
+    if bars == 0:
+        return {'bars': 0, 'days': 0, 'start_date': None, 'end_date': None, 'bad_days': []}
+    days = epochs // 86400
+    first_day = int(days[0])
+    counts = np.bincount(days - first_day)
+    present = np.flatnonzero(counts)
+    bad = present[counts[present] != BARS_PER_DAY] + first_day
+    lo = np.searchsorted(days, bad, side='left')
+    hi = np.searchsorted(days, bad, side='right') - 1
+    return {
+        'bars': bars,
+        'days': bars // BARS_PER_DAY,
+        'start_date': str(np.datetime64(first_day, 'D')),
+        'end_date': str(np.datetime64(int(days[-1]), 'D')),
+        'bad_days': [[str(np.datetime64(int(d), 'D')), int(h - l + 1), int(epochs[l]), int(epochs[h])]
+                     for d, l, h in zip(bad, lo, hi)]
+    }
+
+
+def _stats_with_dates(stats: Dict) -> Dict:
+    """Copy of _epoch_stats output with start_date/end_date as date objects."""
+    stats = dict(stats)
+    for name in ('start_date', 'end_date'):
+        if stats[name] is not None:
+            stats[name] = date.fromisoformat(stats[name])
+    return stats
+
+
+def _manifest_key(data_path: Path, st: Optional[os.stat_result] = None) -> List:
+    """Manifest cache key of a data file: [name, size, mtime_ns] (st avoids a second stat)."""
+    st = st or data_path.stat()
+    return [data_path.name, st.st_size, st.st_mtime_ns]
+
+
+def _read_legacy_csv(path: Path, columns: List[str] = DATA_COLUMNS) -> pd.DataFrame:
+    """Reads columns of a legacy CSV with pyarrow's multithreaded parser and fixed dtypes."""
+    options = pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES, include_columns=columns)
+    return pacsv.read_csv(path, convert_options=options).to_pandas()
+
+
+def _map_bin_records(bin_path: Path) -> Optional[np.ndarray]:
+    """
+    Memory-maps a .bin file as a read-only BIN_RECORD_DTYPE array (no read copy).
+    Returns None when the file does not have the fixed-width record layout.
+    """
+    with open(bin_path, 'rb') as f:
+        header = f.read(8)
+        if len(header) != 8:
+            return None
+        num_bars = struct.unpack('<Q', header)[0]
+        if os.fstat(f.fileno()).st_size != 8 + num_bars * BIN_RECORD_DTYPE.itemsize:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    rec = np.frombuffer(mapped, dtype=BIN_RECORD_DTYPE, count=num_bars, offset=8)
+    if not (rec['ts_len'] == TS_STR_LEN).all():
+        return None
+    return rec
+
+
+def _expand_mm_dd(value: Optional[str]) -> Optional[str]:
+    """Turns an MM-DD date into YYYY-MM-DD of the current year; other values pass through."""
+    if value and MM_DD_PATTERN.fullmatch(value):
+        return f"{date.today().year}-{value}"
+    return value
+
+
+@lru_cache(maxsize=4)
+def _parse_symbols_conf(path_str: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Upper-cased symbols of a symbols.conf in file order, without duplicates (cached per mtime)."""
+    with open(path_str, 'rb') as f:
+        lines = (line.strip() for line in f)
+        return tuple(dict.fromkeys(s.upper().decode() for s in lines if s and not s.startswith(b'#')))
+
+
+def _epoch_date(epoch: int) -> date:
+    """Trading date of a UTC epoch second (UTC day == ET day, see _epoch_stats)."""
+    return date(1970, 1, 1) + timedelta(days=int(epoch) // 86400)
+
+
+def _et_clock(epoch: int) -> str:
+    """HH:MM:SS in New York time for a UTC epoch second."""
+    return pd.Timestamp(epoch, unit='s', tz='UTC').tz_convert(NY_TIMEZONE).strftime('%H:%M:%S')
 
 
 class MarketDataDB:
@@ -50,38 +236,111 @@ class MarketDataDB:
     Manages append-only market data storage with perfect bar alignment.
     """
 
-    def __init__(self, data_dir: str = "data/equities"):
+    def __init__(self, data_dir: str = "data/equities", fetch_workers: int = FETCH_WORKERS):
         self.data_dir = Path(data_dir)
+        self.fetch_workers = max(1, fetch_workers)
+        self._request_slots = BoundedSemaphore(self.fetch_workers)  # Bounds Polygon requests in flight
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.nyse_calendar = mcal.get_calendar('NYSE')
+        self._manifest = None  # Loaded lazily from MANIFEST_NAME
+        self._manifest_lock = RLock()  # Symbols may be updated from several threads
+        self._manifest_batch = 0  # > 0 inside manifest_batch(): saves are deferred
+        self._manifest_dirty = False  # Entries changed since the last save
+        self._holiday_days = None  # Sorted NYSE holidays as epoch days, built on first use
+        self._year_grids = {}  # year -> (bar epoch days, 391-bar RTH index), see _year_grid
 
     def _get_file_paths(self, symbol: str) -> Tuple[Path, Path]:
-        """Returns (csv_path, bin_path) for a given symbol."""
+        """Returns (parquet_path, bin_path) for a given symbol."""
         prefix = f"{symbol.upper()}{FILE_SUFFIX}"
         return (
-            self.data_dir / f"{prefix}.csv",
+            self.data_dir / f"{prefix}.parquet",
             self.data_dir / f"{prefix}.bin"
         )
 
+    def _get_legacy_csv_path(self, symbol: str) -> Path:
+        """Returns the pre-Parquet CSV path for a given symbol."""
+        return self.data_dir / f"{symbol.upper()}{FILE_SUFFIX}.csv"
+
+    def _scan_dir(self) -> Dict[str, os.DirEntry]:
+        """
+        Lists the data directory in one os.scandir pass: {file name: DirEntry}.
+        DirEntry.stat() is cached, so callers get sizes and mtimes without extra lookups.
+        """
+        with os.scandir(self.data_dir) as entries:
+            return {entry.name: entry for entry in entries}
+
+    def _get_data_path(self, symbol: str,
+                       entries: Optional[Dict[str, os.DirEntry]] = None) -> Optional[Path]:
+        """Returns the Parquet file, else a legacy CSV, else None (looked up in entries if given)."""
+        if entries is not None:
+            prefix = f"{symbol.upper()}{FILE_SUFFIX}"
+            for name in (f"{prefix}.parquet", f"{prefix}.csv"):
+                if name in entries:
+                    return self.data_dir / name
+            return None
+        parquet_path, _ = self._get_file_paths(symbol)
+        if parquet_path.exists():
+            return parquet_path
+        csv_path = self._get_legacy_csv_path(symbol)
+        return csv_path if csv_path.exists() else None
+
+    def _get_holiday_days(self) -> np.ndarray:
+        """Returns sorted NYSE holiday dates as int64 days since the epoch."""
+        if self._holiday_days is None:
+            holidays = self.nyse_calendar.holidays().holidays
+            self._holiday_days = np.sort(np.asarray(holidays, dtype='datetime64[D]').view('i8'))
+        return self._holiday_days
+
+    def _year_grid(self, year: int) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+        """
+        Returns the 391-bar RTH grid for every NYSE weekday session of a year that
+        isn't a holiday, localized to New York, plus each bar's epoch day.
+        Cached per instance, so every symbol updated or synced shares one grid.
+        """
+        grid = self._year_grids.get(year)
+        if grid is None:
+            days = np.arange(np.datetime64(f'{year}-01-01'), np.datetime64(f'{year + 1}-01-01'),
+                             dtype='datetime64[D]')
+            days = days[np.is_busday(days)]
+            days = days[~np.isin(days.view('i8'), self._get_holiday_days())]
+            session_starts = days.astype('datetime64[ns]') + np.timedelta64(9 * 60 + 30, 'm')
+            bar_offsets = np.arange(BARS_PER_DAY, dtype='timedelta64[m]')
+            index = pd.DatetimeIndex(
+                (session_starts[:, None] + bar_offsets[None, :]).ravel()
+            ).tz_localize(NY_TIMEZONE)
+            grid = self._year_grids[year] = (np.repeat(days.view('i8'), BARS_PER_DAY), index)
+        return grid
+
+    def session_count(self, start: date, end: date) -> int:
+        """Number of NYSE sessions in [start, end], counted on the cached _year_grid days."""
+        lo, hi = (np.datetime64(d, 'D').view('i8') for d in (start, end))
+        count = 0
+        for year in range(start.year, end.year + 1):
+            days = self._year_grid(year)[0][::BARS_PER_DAY]
+            count += int(np.count_nonzero((days >= lo) & (days <= hi)))
+        return count
+
     def read_existing_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """
-        Reads existing data from CSV file if it exists.
+        Reads existing data from the Parquet file (or a legacy CSV) if it exists.
         Returns None if file doesn't exist or is empty.
         """
-        csv_path, _ = self._get_file_paths(symbol)
+        data_path = self._get_data_path(symbol)
 
-        if not csv_path.exists():
+        if data_path is None:
             return None
 
         try:
-            df = pd.read_csv(csv_path)
+            if data_path.suffix == '.parquet':
+                # Memory-mapped: column buffers are read straight from the page cache
+                df = pd.read_parquet(data_path, columns=BAR_COLUMNS, memory_map=True)
+            else:
+                df = _read_legacy_csv(data_path, BAR_COLUMNS)
             if df.empty:
                 return None
 
-            # Parse the timestamp and set as index
-            df['ts_utc'] = pd.to_datetime(df['ts_utc'])
-            df.set_index('ts_utc', inplace=True)
-            df.index = df.index.tz_convert(NY_TIMEZONE)
+            # Index by time straight from the epoch column (no string parsing)
+            df.index = _ny_index(df['ts_epoch_utc'].to_numpy() * 10**9, name='ts_utc')
 
             print(f"✓ Existing data loaded: {len(df)} bars ({len(df)//BARS_PER_DAY} days)")
             return df
@@ -90,6 +349,201 @@ class MarketDataDB:
             print(f"⚠ Warning: Could not read existing data for {symbol}: {e}")
             return None
 
+    def _load_manifest(self) -> Dict:
+        with self._manifest_lock:
+            if self._manifest is None:
+                try:
+                    self._manifest = json.loads((self.data_dir / MANIFEST_NAME).read_text())
+                except (OSError, ValueError):
+                    self._manifest = {}
+            return self._manifest
+
+    def _save_manifest(self):
+        manifest_path = self.data_dir / MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with self._manifest_lock:
+            tmp_path.write_text(json.dumps(self._manifest, indent=1, sort_keys=True))
+            os.replace(tmp_path, manifest_path)
+            self._manifest_dirty = False
+
+    @contextmanager
+    def manifest_batch(self):
+        """
+        Defers manifest saves for per-symbol loops: entries refreshed inside the block
+        are written once on exit instead of rewriting the whole file per symbol.
+        """
+        with self._manifest_lock:
+            self._manifest_batch += 1
+        try:
+            yield
+        finally:
+            with self._manifest_lock:
+                self._manifest_batch -= 1
+                if not self._manifest_batch and self._manifest_dirty:
+                    self._save_manifest()
+
+    def _read_epochs(self, data_path: Path) -> np.ndarray:
+        """Reads just the ts_epoch_utc column of a data file."""
+        if data_path.suffix == '.parquet':
+            table = pq.read_table(data_path, columns=['ts_epoch_utc'], memory_map=True)
+            return table.column(0).to_numpy()
+        return _read_legacy_csv(data_path, ['ts_epoch_utc'])['ts_epoch_utc'].to_numpy()
+
+    def _parquet_footer(self, data_path: Path) -> Optional[Tuple[int, int, int]]:
+        """
+        Returns (rows, first_epoch, last_epoch) from a Parquet file's footer statistics
+        without reading any data, or None if the file has no usable statistics.
+        """
+        if data_path.suffix != '.parquet':
+            return None
+        try:
+            meta = pq.read_metadata(data_path)
+            column = meta.schema.to_arrow_schema().get_field_index('ts_epoch_utc')
+            groups = [meta.row_group(i).column(column).statistics for i in range(meta.num_row_groups)]
+            if not groups or any(st is None or not st.has_min_max for st in groups):
+                return None
+            return meta.num_rows, min(st.min for st in groups), max(st.max for st in groups)
+        except Exception:
+            return None
+
+    def get_stored_date_range(self, symbol: str) -> Optional[Tuple[date, date]]:
+        """
+        Returns (start_date, end_date) of a symbol's stored data, or None if no data.
+        Uses the manifest, then Parquet footer statistics, instead of loading bars.
+        """
+        data_path = self._get_data_path(symbol)
+        if data_path is None:
+            return None
+        stats = self._cached_stats(symbol, data_path)
+        if stats is not None:
+            return (stats['start_date'], stats['end_date']) if stats['bars'] else None
+        footer = self._parquet_footer(data_path)
+        if footer is not None:
+            rows, first_epoch, last_epoch = footer
+            return (_epoch_date(first_epoch), _epoch_date(last_epoch)) if rows else None
+        stats = self.scan_stats(symbol)
+        if not stats or not stats['bars']:
+            return None
+        return (stats['start_date'], stats['end_date'])
+
+    def get_date_range_fast(self, symbol: str) -> Optional[Tuple[date, date]]:
+        """
+        Returns (start_date, end_date) from the first and last record of the symbol's
+        fixed-width .bin file (two seeks, independent of the bar count). Falls back to
+        get_stored_date_range() when the .bin is missing, empty or variable-width.
+        """
+        _, bin_path = self._get_file_paths(symbol)
+        record_size = BIN_RECORD_DTYPE.itemsize
+        try:
+            with open(bin_path, 'rb') as f:
+                header = f.read(8)
+                num_bars = struct.unpack('<Q', header)[0] if len(header) == 8 else 0
+                if num_bars and os.fstat(f.fileno()).st_size == 8 + num_bars * record_size:
+                    first = np.frombuffer(f.read(record_size), dtype=BIN_RECORD_DTYPE)[0]
+                    f.seek(-record_size, os.SEEK_END)
+                    last = np.frombuffer(f.read(record_size), dtype=BIN_RECORD_DTYPE)[0]
+                    if first['ts_len'] == TS_STR_LEN and last['ts_len'] == TS_STR_LEN:
+                        return (_epoch_date(first['ts_epoch_utc']), _epoch_date(last['ts_epoch_utc']))
+        except OSError:
+            pass
+        return self.get_stored_date_range(symbol)
+
+    def misaligned_symbols(self, symbols: List[str], start: date, end: date) -> List[str]:
+        """
+        Returns the symbols whose stored range is not exactly [start, end], in input order
+        (symbols without data count as misaligned). Ranges come from get_date_range_fast()
+        and are compared in one datetime64 array operation.
+        """
+        with self.manifest_batch():
+            ranges = np.array([self.get_date_range_fast(s) or (None, None) for s in symbols],
+                              dtype='datetime64[D]').reshape(-1, 2)
+        off = (ranges != np.array([start, end], dtype='datetime64[D]')).any(axis=1)
+        return [s for s, is_off in zip(symbols, off) if is_off]
+
+    def symbols_to_fetch(self, symbols: List[str], start: date, end: date) -> List[str]:
+        """
+        Returns the symbols a backfill of [start, end] must fetch, in input order: the
+        misaligned_symbols() plus any whose stored days miss an NYSE session of the range
+        (gaps inside an aligned range) or hold bad days. While end is today or later in
+        New York every symbol is fetched, as filter_and_align forward-fills a partial session.
+        """
+        if end >= pd.Timestamp.now(tz=NY_TIMEZONE).date():
+            return list(symbols)
+        pending = set(self.misaligned_symbols(symbols, start, end))
+        sessions = self.session_count(start, end)
+        with self.manifest_batch():
+            for symbol in symbols:
+                if symbol not in pending:
+                    stats = self.scan_stats(symbol)
+                    if not stats or stats['days'] != sessions or stats['bad_days']:
+                        pending.add(symbol)
+        return [s for s in symbols if s in pending]
+
+    def scan_stats(self, symbol: str, persist: bool = True,
+                   entries: Optional[Dict[str, os.DirEntry]] = None) -> Optional[Dict]:
+        """
+        Returns bar/day counts, date range and bad days for a symbol's data file,
+        reading only the ts_epoch_utc column. Results are cached in the manifest and
+        reused while the file's size and mtime are unchanged; persist=False keeps a
+        fresh result in memory only (worker processes leave the file to the parent).
+        entries (from _scan_dir) replaces per-file existence and stat lookups.
+        Returns None if the file doesn't exist or can't be read.
+        """
+        data_path = self._get_data_path(symbol, entries)
+        if data_path is None:
+            return None
+
+        st = entries[data_path.name].stat() if entries is not None else None
+        stats = self._cached_stats(symbol, data_path, st)
+        if stats is not None:
+            return stats
+        try:
+            epochs = self._read_epochs(data_path)
+        except Exception as e:
+            print(f"⚠ Warning: Could not scan data for {symbol}: {e}")
+            return None
+        return self._record_stats(symbol, data_path, epochs, persist)
+
+    def scan_bin_stats(self, symbol: str) -> Optional[Dict]:
+        """
+        Same fields as scan_stats, for the symbol's .bin file: one pass over the
+        memory-mapped ts_epoch_utc field, without building a DataFrame (variable-width
+        files go through _read_binary_file). Returns None if missing, empty or unreadable.
+        """
+        _, bin_path = self._get_file_paths(symbol)
+        try:
+            rec = _map_bin_records(bin_path)
+        except (OSError, ValueError):
+            return None
+        if rec is not None:
+            epochs = rec['ts_epoch_utc']
+        else:
+            bin_df = self._read_binary_file(bin_path)
+            epochs = bin_df['ts_epoch_utc'].to_numpy() if bin_df is not None else None
+        if epochs is None or not len(epochs):
+            return None
+        return _stats_with_dates(_epoch_stats(epochs))
+
+    def _cached_stats(self, symbol: str, data_path: Path,
+                      st: Optional[os.stat_result] = None) -> Optional[Dict]:
+        """Manifest stats for a data file, or None if absent or stale (size/mtime changed)."""
+        entry = self._load_manifest().get(symbol.upper())
+        if entry is None or entry.get('key') != _manifest_key(data_path, st):
+            return None
+        return _stats_with_dates(entry['stats'])
+
+    def _record_stats(self, symbol: str, data_path: Path, epochs: np.ndarray,
+                      persist: bool = True) -> Dict:
+        """Computes a data file's stats from its epochs and caches them in the manifest."""
+        entry = {'key': _manifest_key(data_path), 'stats': _epoch_stats(epochs)}
+        with self._manifest_lock:
+            self._load_manifest()[symbol.upper()] = entry
+            if persist and self._manifest_batch:
+                self._manifest_dirty = True
+            elif persist:
+                self._save_manifest()
+        return _stats_with_dates(entry['stats'])
+
     def get_date_range(self, df: Optional[pd.DataFrame]) -> Optional[Tuple[datetime, datetime]]:
         """Returns (start_date, end_date) of existing data, or None if no data."""
         if df is None or df.empty:
@@ -103,50 +557,86 @@ class MarketDataDB:
         """
         print(f"📡 Fetching '{symbol}' from Polygon.io ({start_date} to {end_date})...")
 
+        # Pagination only chains within one range, but month shards are independent,
+        # so they are fetched concurrently over one keep-alive session
+        shards = _month_shards(start_date, end_date)
+        progress = {'bars': 0, 'lock': Lock()}
+
+        with requests.Session() as session:
+            session.headers["Authorization"] = f"Bearer {api_key}"
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.fetch_workers)
+            session.mount("https://", adapter)
+
+            def fetch_shard(shard: Tuple[str, str]) -> Optional[List[np.ndarray]]:
+                return self._fetch_range(session, symbol, shard[0], shard[1],
+                                         timespan, multiplier, progress)
+
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(shards) or 1)) as pool:
+                shard_pages = list(pool.map(fetch_shard, shards))
+
+        if any(pages is None for pages in shard_pages):
+            return None
+        pages = [page for shard in shard_pages for page in shard]
+        total = sum(len(page) for page in pages)
+
+        print(f"\n   ✓ Total bars fetched: {total}")
+
+        if not total:
+            return None
+
+        # Pages already have the final dtypes; concatenation is one contiguous copy
+        return pd.DataFrame(np.concatenate(pages))
+
+    def _fetch_range(self, session: requests.Session, symbol: str, start_date: str, end_date: str,
+                     timespan: str, multiplier: int, progress: Dict) -> Optional[List[np.ndarray]]:
+        """
+        Fetches one date range, following next_url pages serially. Requests hold one of
+        the shared request slots; an HTTP 429 is retried up to FETCH_RETRIES times after
+        its Retry-After seconds (else exponential backoff).
+        Returns the pages in order as POLYGON_BAR_DTYPE arrays, or None on error.
+        """
         url = (
             f"{POLYGON_API_BASE}/v2/aggs/ticker/{symbol}/range/{multiplier}/{timespan}/"
             f"{start_date}/{end_date}?adjusted=true&sort=asc&limit=50000"
         )
-
-        headers = {"Authorization": f"Bearer {api_key}"}
-        all_bars = []
+        pages = []
+        retries = 0
 
         while url:
             try:
-                response = requests.get(url, headers=headers, timeout=30)
+                with self._request_slots:
+                    response = session.get(url, timeout=30)
+                if response.status_code == 429 and retries < FETCH_RETRIES:
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay = float(retry_after) if retry_after.isdigit() else 2.0 ** retries
+                    retries += 1
+                    print(f"\n   ⏳ Rate limited ({start_date} to {end_date}); retrying in {delay:g}s")
+                    time.sleep(delay)
+                    continue
+                retries = 0
                 response.raise_for_status()
-                data = response.json()
-
-                if "results" in data:
-                    all_bars.extend(data["results"])
-                    print(f"   Fetched {len(all_bars)} bars...", end="\r")
+                data = _json_loads(response.content)
+
+                results = data.get("results")
+                if results:
+                    page = np.empty(len(results), dtype=POLYGON_BAR_DTYPE)
+                    for key, column in POLYGON_BAR_FIELDS:
+                        page[column] = [bar.get(key, np.nan) for bar in results]
+                    pages.append(page)
+                    with progress['lock']:
+                        progress['bars'] += len(results)
+                        print(f"   Fetched {progress['bars']} bars...", end="\r")
 
                 url = data.get("next_url")
 
             except requests.exceptions.RequestException as e:
-                print(f"\n❌ API Error: {e}")
+                print(f"\n❌ API Error ({start_date} to {end_date}): {e}")
                 return None
             except Exception as e:
-                print(f"\n❌ Unexpected error: {e}")
+                print(f"\n❌ Unexpected error ({start_date} to {end_date}): {e}")
                 return None
 
-        print(f"\n   ✓ Total bars fetched: {len(all_bars)}")
-
-        if not all_bars:
-            return None
-
-        # Convert to DataFrame
-        df = pd.DataFrame(all_bars)
-        df.rename(columns={
-            't': 'timestamp_utc_ms',
-            'o': 'open',
-            'h': 'high',
-            'l': 'low',
-            'c': 'close',
-            'v': 'volume'
-        }, inplace=True)
-
-        return df
+        return pages
 
     def filter_and_align(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -158,51 +648,62 @@ class MarketDataDB:
         print("🔧 Processing: RTH filter + holiday removal + 391-bar alignment...")
 
         # Convert to NY timezone
-        df['timestamp_utc_ms'] = pd.to_datetime(df['timestamp_utc_ms'], unit='ms', utc=True)
-        df.set_index('timestamp_utc_ms', inplace=True)
-        df.index = df.index.tz_convert(NY_TIMEZONE)
+        df = df.set_index(_ny_index(df.pop('timestamp_utc_ms').to_numpy() * 10**6))
 
         # Filter for RTH (9:30 AM to 4:00 PM)
         df = df.between_time(RTH_START, RTH_END)
 
-        # Remove market holidays
-        holidays = self.nyse_calendar.holidays().holidays
-        df = df[~df.index.normalize().isin(holidays)]
+        # Remove market holidays (match each bar's ET calendar day against the sorted list)
+        holiday_days = self._get_holiday_days()
+        bar_days = df.index.tz_localize(None).asi8 // (86400 * 10**9)
+        hits = np.searchsorted(holiday_days, bar_days).clip(max=len(holiday_days) - 1)
+        df = df[holiday_days[hits] != bar_days]
 
         print(f"   → {len(df)} bars after RTH/holiday filtering")
 
-        # Create perfect 391-bar grid
-        trading_days = df.index.normalize().unique()
-        complete_index = pd.DatetimeIndex([], tz=NY_TIMEZONE)
-
-        for day in trading_days:
-            day_start = day.replace(hour=9, minute=30, second=0, microsecond=0)
-            day_end = day.replace(hour=16, minute=0, second=0, microsecond=0)
-            day_range = pd.date_range(start=day_start, end=day_end, freq='1min', tz=NY_TIMEZONE)
-            complete_index = complete_index.union(day_range)
-
-        # Reindex and forward-fill
-        df_aligned = df.reindex(complete_index)
-        df_aligned = df_aligned.ffill().bfill()
-
-        # Verify alignment
-        bars_per_day = df_aligned.groupby(df_aligned.index.date).size()
-        misaligned_days = [date for date, count in bars_per_day.items() if count != BARS_PER_DAY]
-
-        if misaligned_days:
-            print(f"   ⚠ WARNING: {len(misaligned_days)} days with incorrect bar count:")
-            for date in misaligned_days[:5]:  # Show first 5
-                print(f"      {date}: {bars_per_day[date]} bars (expected {BARS_PER_DAY})")
+        # Create perfect 391-bar grid: the cached yearly session grids, restricted
+        # to the trading days present in the data
+        trading_days = df.index.normalize().unique().sort_values()
+        day_ints = trading_days.tz_localize(None).asi8 // (86400 * 10**9)
+        pieces = []
+        for year in np.unique(trading_days.year):
+            bar_days, year_index = self._year_grid(int(year))
+            pieces.append(year_index[np.isin(bar_days, day_ints)])
+        complete_index = pieces[0].append(pieces[1:]) if pieces else pd.DatetimeIndex([], tz=NY_TIMEZONE)
+
+        # Reindex and forward-fill on the int64 epochs: keep the bars that sit on the grid,
+        # then every slot takes the last bar at or before it. Slots ahead of the first bar
+        # take the first bar (the leading block is back-filled).
+        grid = complete_index.asi8
+        bar_ts = df.index.asi8
+        slot = np.searchsorted(grid, bar_ts).clip(max=max(len(grid) - 1, 0))
+        on_grid = grid[slot] == bar_ts if len(grid) else np.zeros(len(bar_ts), dtype=bool)
+        values = df.to_numpy(dtype=np.float64)[on_grid]
+        if len(values):
+            values = values[(np.searchsorted(bar_ts[on_grid], grid, side='right') - 1).clip(min=0)]
         else:
-            print(f"   ✓ Perfect alignment: {len(trading_days)} days × {BARS_PER_DAY} bars = {len(df_aligned)} bars")
+            values = np.full((len(grid), df.shape[1]), np.nan)
+        df_aligned = pd.DataFrame(values, index=complete_index, columns=df.columns)
+
+        # Verify alignment on the int64 grid (UTC day == ET day, see _epoch_stats);
+        # only the offending days are turned into dates
+        days, bars_per_day = np.unique(grid // (86400 * 10**9), return_counts=True)
+        misaligned = bars_per_day != BARS_PER_DAY
+
+        if misaligned.any():
+            bad_days = days[misaligned].astype('datetime64[D]')
+            bad_counts = bars_per_day[misaligned]
+            print(f"   ⚠ WARNING: {len(bad_days)} days with incorrect bar count:")
+            for d, count in zip(bad_days[:5], bad_counts[:5]):  # Show first 5
+                print(f"      {d}: {count} bars (expected {BARS_PER_DAY})")
+        else:
+            print(f"   ✓ Perfect alignment: {len(days)} days × {BARS_PER_DAY} bars = {len(df_aligned)} bars")
 
         # Add required columns
         # ts_utc_str: ET-formatted timestamp string (for readability)
-        df_aligned['ts_utc'] = df_aligned.index.strftime('%Y-%m-%dT%H:%M:%S%z').str.replace(
-            r'([+-])(\d{2})(\d{2})', r'\1\2:\3', regex=True
-        )
+        df_aligned['ts_utc'] = _format_ts_strings(df_aligned.index)
         # ts_epoch_utc: true UTC epoch seconds (for engine correctness)
-        df_aligned['ts_epoch_utc'] = df_aligned.index.tz_convert('UTC').astype('int64') // 10**9
+        df_aligned['ts_epoch_utc'] = grid // 10**9
 
         return df_aligned
 
@@ -235,13 +736,25 @@ class MarketDataDB:
 
         # Keep only OHLCV columns for merging (drop ts_utc/ts_nyt_epoch - will regenerate)
         ohlcv_cols = ['open', 'high', 'low', 'close', 'volume']
-        existing_clean = existing[ohlcv_cols].copy() if existing is not None else None
-        new_clean = new[ohlcv_cols].copy()
-
-        # Combine and remove duplicates (keep new data for overlaps)
-        combined = pd.concat([existing_clean, new_clean])
-        combined = combined[~combined.index.duplicated(keep='last')]
-        combined = combined.sort_index()
+        # Both sides are sorted grids: splice the new bars over the span of existing
+        # bars they cover (new data wins on overlaps), locating it by binary search
+        new_clean = new[ohlcv_cols]
+        if new_clean.empty:
+            combined = existing[ohlcv_cols]
+        else:
+            ex_ns, new_ns = existing.index.asi8, new_clean.index.asi8
+            lo = ex_ns.searchsorted(new_ns[0], side='left')
+            hi = ex_ns.searchsorted(new_ns[-1], side='right')
+            pos = new_ns.searchsorted(ex_ns[lo:hi]).clip(max=len(new_ns) - 1)
+            replaced = new_ns[pos] == ex_ns[lo:hi]
+            head = existing.iloc[:lo][ohlcv_cols]
+            tail = existing.iloc[hi:][ohlcv_cols]
+            if replaced.all():
+                combined = pd.concat([head, new_clean, tail])
+            else:
+                # The fetch skips days the existing data has inside its span: keep those
+                middle = existing.iloc[lo:hi][ohlcv_cols][~replaced]
+                combined = pd.concat([head, new_clean, middle, tail]).sort_index()
 
         stats['added_bars'] = len(combined) - len(existing)
         stats['overlapping_bars'] = len(existing) + len(new) - len(combined)
@@ -260,33 +773,84 @@ class MarketDataDB:
 
     def save_data(self, df: pd.DataFrame, symbol: str):
         """
-        Saves DataFrame to both CSV and binary format.
+        Saves DataFrame to both Parquet and binary format.
         """
-        csv_path, bin_path = self._get_file_paths(symbol)
+        parquet_path, bin_path = self._get_file_paths(symbol)
 
         # Ensure ts_utc and ts_epoch_utc columns exist (regenerate if needed after merge)
         if 'ts_utc' not in df.columns or 'ts_epoch_utc' not in df.columns:
-            df['ts_utc'] = df.index.strftime('%Y-%m-%dT%H:%M:%S%z').str.replace(
-                r'([+-])(\d{2})(\d{2})', r'\1\2:\3', regex=True
-            )
-            df['ts_epoch_utc'] = df.index.tz_convert('UTC').astype('int64') // 10**9
+            df['ts_utc'] = _format_ts_strings(df.index)
+            df['ts_epoch_utc'] = df.index.asi8 // 10**9
 
-        # Save CSV
-        print(f"💾 Saving CSV to {csv_path}...")
-        csv_columns = ['ts_utc', 'ts_epoch_utc', 'open', 'high', 'low', 'close', 'volume']
-        df_to_save = df[csv_columns].copy()
-        df_to_save.to_csv(csv_path, index=False)
+        # Save Parquet
+        print(f"💾 Saving Parquet to {parquet_path}...")
+        self._save_parquet(df, parquet_path)
+
+        # Parquet now holds everything the legacy CSV had (it was merged in)
+        csv_path = self._get_legacy_csv_path(symbol)
+        if csv_path.exists():
+            csv_path.unlink()
 
         # Save binary
         print(f"💾 Saving binary to {bin_path}...")
         self._save_binary(df, bin_path)
 
+        # Refresh the manifest from the bars in hand, so read paths never rescan the file
+        self._record_stats(symbol, parquet_path, df['ts_epoch_utc'].to_numpy())
+
         print(f"   ✓ Saved {len(df)} bars ({len(df)//BARS_PER_DAY} days)")
 
+    def _save_parquet(self, df: pd.DataFrame, path: Path):
+        """
+        Saves the data columns as a ZSTD-compressed Parquet file.
+        """
+        df[DATA_COLUMNS].to_parquet(
+            path,
+            engine='pyarrow',
+            index=False,
+            compression='zstd',
+            compression_level=3,
+            row_group_size=PARQUET_ROW_GROUP
+        )
+
+    def migrate_to_parquet(self) -> int:
+        """
+        Converts every legacy CSV in the database to Parquet (the .bin is left as is).
+        Returns the number of symbols converted.
+        """
+        converted = 0
+        for csv_file in sorted(self.data_dir.glob(f"*{FILE_SUFFIX}.csv")):
+            symbol = csv_file.stem.replace(FILE_SUFFIX, '')
+            parquet_path, _ = self._get_file_paths(symbol)
+            try:
+                df = _read_legacy_csv(csv_file)
+                self._save_parquet(df, parquet_path)
+                csv_file.unlink()
+                print(f"✓ {symbol}: {len(df)} bars → {parquet_path.name}")
+                converted += 1
+            except Exception as e:
+                print(f"⚠ Could not migrate {symbol}: {e}")
+        return converted
+
     def _save_binary(self, df: pd.DataFrame, path: Path):
         """
         Saves to C++ compatible binary format.
         """
+        ts_bytes = np.char.encode(df['ts_utc'].to_numpy().astype(str), 'utf-8')
+        if len(df) and (np.char.str_len(ts_bytes) == TS_STR_LEN).all():
+            # Fixed-width timestamps: build every record at once and write in one call
+            rec = np.empty(len(df), dtype=BIN_RECORD_DTYPE)
+            rec['ts_len'] = TS_STR_LEN
+            rec['ts_utc'] = ts_bytes
+            rec['ts_epoch_utc'] = df['ts_epoch_utc'].to_numpy()
+            for col in ('open', 'high', 'low', 'close'):
+                rec[col] = df[col].to_numpy()
+            rec['volume'] = df['volume'].to_numpy().astype('<u8')
+            with open(path, 'wb') as f:
+                f.write(struct.pack('<Q', len(df)))
+                f.write(rec.tobytes())
+            return
+
         with open(path, 'wb') as f:
             # Write total bar count
             num_bars = len(df)
@@ -312,11 +876,15 @@ class MarketDataDB:
                 )
                 f.write(packed)
 
-    def get_status(self, symbol: str) -> Dict:
-        """Returns status information about a symbol's data."""
-        csv_path, bin_path = self._get_file_paths(symbol)
+    def get_status(self, symbol: str, entries: Optional[Dict[str, os.DirEntry]] = None) -> Dict:
+        """
+        Returns status information about a symbol's data. Pass entries (from _scan_dir)
+        when querying many symbols, to reuse one directory listing for every stat.
+        """
+        data_path = self._get_data_path(symbol, entries)
+        _, bin_path = self._get_file_paths(symbol)
 
-        if not csv_path.exists():
+        if data_path is None:
             return {
                 'symbol': symbol,
                 'exists': False,
@@ -324,31 +892,85 @@ class MarketDataDB:
                 'days': 0,
                 'start_date': None,
                 'end_date': None,
-                'csv_size_kb': 0,
+                'data_size_kb': 0,
                 'bin_size_kb': 0
             }
 
-        df = self.read_existing_data(symbol)
+        if entries is not None:
+            data_st = entries[data_path.name].stat()
+            bin_entry = entries.get(bin_path.name)
+            bin_size = bin_entry.stat().st_size if bin_entry is not None else 0
+        else:
+            data_st = data_path.stat()
+            bin_size = bin_path.stat().st_size if bin_path.exists() else 0
+
+        stats = self._cached_stats(symbol, data_path, data_st)
+        footer = self._parquet_footer(data_path) if stats is None else None
+        if stats is not None:
+            bars, start_date, end_date = stats['bars'], stats['start_date'], stats['end_date']
+        elif footer is not None:
+            bars, first_epoch, last_epoch = footer
+            start_date = _epoch_date(first_epoch) if bars else None
+            end_date = _epoch_date(last_epoch) if bars else None
+        else:
+            df = self.read_existing_data(symbol)
+            bars = len(df) if df is not None else 0
+            start_date = df.index.min().date() if df is not None else None
+            end_date = df.index.max().date() if df is not None else None
 
         return {
             'symbol': symbol,
             'exists': True,
-            'bars': len(df),
-            'days': len(df) // BARS_PER_DAY,
-            'start_date': df.index.min().date() if df is not None else None,
-            'end_date': df.index.max().date() if df is not None else None,
-            'csv_size_kb': csv_path.stat().st_size // 1024,
-            'bin_size_kb': bin_path.stat().st_size // 1024 if bin_path.exists() else 0
+            'bars': bars,
+            'days': bars // BARS_PER_DAY,
+            'start_date': start_date,
+            'end_date': end_date,
+            'data_size_kb': data_st.st_size // 1024,
+            'bin_size_kb': bin_size // 1024
         }
 
-    def list_all_symbols(self) -> List[str]:
-        """Returns list of all symbols in the database."""
-        symbols = []
-        for csv_file in self.data_dir.glob(f"*{FILE_SUFFIX}.csv"):
-            symbol = csv_file.stem.replace(FILE_SUFFIX, '')
-            symbols.append(symbol)
+    def list_all_symbols(self, entries: Optional[Dict[str, os.DirEntry]] = None) -> List[str]:
+        """Returns list of all symbols in the database (from entries if given)."""
+        if entries is None:
+            entries = self._scan_dir()
+        symbols = set()
+        for name in entries:
+            for suffix in (f"{FILE_SUFFIX}.parquet", f"{FILE_SUFFIX}.csv"):
+                if name.endswith(suffix):
+                    symbols.add(name[:-len(suffix)])
         return sorted(symbols)
 
+    def remove_symbols(self, symbols: List[str]) -> Dict[str, Optional[OSError]]:
+        """
+        Deletes the data (Parquet or legacy CSV) and .bin files of the given symbols in a
+        single directory pass, and drops their manifest entries.
+        Returns {symbol: None on success, or the OSError that stopped a removal}.
+        """
+        owners = {}
+        for symbol in symbols:
+            prefix = f"{symbol.upper()}{FILE_SUFFIX}"
+            for ext in ('.parquet', '.csv', '.bin'):
+                owners[prefix + ext] = symbol
+        results: Dict[str, Optional[OSError]] = dict.fromkeys(symbols)
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                symbol = owners.get(entry.name)
+                if symbol is None:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    results[symbol] = e
+
+        with self._manifest_lock:
+            manifest = self._load_manifest()
+            dropped = [s for s in symbols if manifest.pop(s.upper(), None) is not None]
+            if dropped:
+                self._save_manifest()
+        return results
+
     def list_trading_days(self, symbol: str = None) -> List[str]:
         """
         Returns list of trading days (dates) available in the database.
@@ -363,39 +985,43 @@ class MarketDataDB:
                 return []
             symbol = symbols[0]
 
-        df = self.read_existing_data(symbol)
-        if df is None or df.empty:
+        data_path = self._get_data_path(symbol)
+        if data_path is None:
+            return []
+        try:
+            epochs = self._read_epochs(data_path)
+        except Exception as e:
+            print(f"⚠ Warning: Could not read trading days for {symbol}: {e}")
             return []
 
-        # Get unique trading days
-        trading_days = df.index.normalize().unique()
-        dates = [day.strftime('%Y-%m-%d') for day in sorted(trading_days)]
-
-        return dates
+        # Get unique trading days (only the timestamp column is read)
+        trading_days = np.unique(epochs // 86400).astype('datetime64[D]')
+        return [str(day) for day in trading_days]
 
     def verify_integrity(self, symbols: List[str]) -> bool:
         """Checks that all symbols have identical day counts and bar counts (391 per day)."""
         ok = True
         reference_days = None
         reference_bars = None
-        for symbol in symbols:
-            df = self.read_existing_data(symbol)
-            if df is None or df.empty:
-                print(f"⚠ Integrity: {symbol} has no data")
-                ok = False
-                continue
-            bars = len(df)
-            days = bars // BARS_PER_DAY
-            if bars != days * BARS_PER_DAY:
-                print(f"⚠ Integrity: {symbol} bars {bars} not equal to {days}×{BARS_PER_DAY}")
-                ok = False
-            if reference_days is None:
-                reference_days = days
-                reference_bars = bars
-            else:
-                if days != reference_days or bars != reference_bars:
-                    print(f"⚠ Integrity: {symbol} days/bars mismatch (days={days}, bars={bars}) vs ref (days={reference_days}, bars={reference_bars})")
+        with self.manifest_batch():
+            for symbol in symbols:
+                stats = self.scan_stats(symbol)
+                if not stats or not stats['bars']:
+                    print(f"⚠ Integrity: {symbol} has no data")
+                    ok = False
+                    continue
+                bars = stats['bars']
+                days = stats['days']
+                if bars != days * BARS_PER_DAY:
+                    print(f"⚠ Integrity: {symbol} bars {bars} not equal to {days}×{BARS_PER_DAY}")
                     ok = False
+                if reference_days is None:
+                    reference_days = days
+                    reference_bars = bars
+                else:
+                    if days != reference_days or bars != reference_bars:
+                        print(f"⚠ Integrity: {symbol} days/bars mismatch (days={days}, bars={bars}) vs ref (days={reference_days}, bars={reference_bars})")
+                        ok = False
         if ok:
             print(f"✓ Integrity OK: {len(symbols)} symbols aligned to {reference_days} days × {BARS_PER_DAY} bars = {reference_bars} bars")
         return ok
@@ -409,6 +1035,23 @@ class MarketDataDB:
             return None
 
         try:
+            # Fast path: every record has the fixed-width timestamp, so the whole
+            # body is one memory-mapped BIN_RECORD_DTYPE array
+            rec = _map_bin_records(bin_path)
+            if rec is not None:
+                if len(rec) == 0:
+                    return None
+                df = pd.DataFrame({
+                    'ts_epoch_utc': rec['ts_epoch_utc'],
+                    'open': rec['open'],
+                    'high': rec['high'],
+                    'low': rec['low'],
+                    'close': rec['close'],
+                    'volume': rec['volume'].astype(np.int64)
+                })
+                df.index = _ny_index(df['ts_epoch_utc'].to_numpy() * 10**9, name='ts_utc')
+                return df
+
             with open(bin_path, 'rb') as f:
                 # Read total bar count
                 num_bars_bytes = f.read(8)
@@ -447,10 +1090,8 @@ class MarketDataDB:
                         'volume': volume
                     })
 
-                df = pd.DataFrame(data)
-                df['ts_utc'] = pd.to_datetime(df['ts_utc'])
-                df.set_index('ts_utc', inplace=True)
-                df.index = df.index.tz_convert(NY_TIMEZONE)
+                df = pd.DataFrame(data).drop(columns='ts_utc')
+                df.index = _ny_index(df['ts_epoch_utc'].to_numpy() * 10**9, name='ts_utc')
 
                 return df
 
@@ -462,7 +1103,7 @@ class MarketDataDB:
         Comprehensive data validation:
         1. Check all symbols have the same date range
         2. Verify each day has exactly 391 bars (09:30-16:00)
-        3. Check both CSV and binary files exist and match
+        3. Check both data (Parquet) and binary files exist and match
         4. Report detailed errors for any discrepancies
 
         Returns True if all checks pass, False otherwise.
@@ -481,107 +1122,62 @@ class MarketDataDB:
         all_errors = []
         reference_date_range = None
         reference_days = None
-        csv_issues = []
+        # Symbols with each kind of issue; each list is unique and in symbol order
+        data_issues = []
         bin_issues = []
         mismatch_issues = []
+        manifest_changed = False
 
+        # Checks 1-3 are independent per symbol. A manifest hit costs about a millisecond,
+        # less than starting a worker, so processes are used only for many file rescans
+        entries = self._scan_dir()
+        scans = 0
         for symbol in symbols:
-            csv_path, bin_path = self._get_file_paths(symbol)
-
-            # === CHECK 1: CSV File Validation ===
-            if not csv_path.exists():
-                all_errors.append(f"❌ {symbol}: CSV file missing")
-                csv_issues.append(symbol)
-                continue
-
-            csv_df = self.read_existing_data(symbol)
-            if csv_df is None or csv_df.empty:
-                all_errors.append(f"❌ {symbol}: CSV file exists but is empty or unreadable")
-                csv_issues.append(symbol)
-                continue
-
-            # Check CSV date range
-            csv_date_range = self.get_date_range(csv_df)
-            csv_start = csv_date_range[0]
-            csv_end = csv_date_range[1]
-
-            # Check CSV bar count alignment
-            csv_bars = len(csv_df)
-            csv_days = csv_bars // BARS_PER_DAY
-
-            if csv_bars != csv_days * BARS_PER_DAY:
-                all_errors.append(f"❌ {symbol} CSV: Total bars {csv_bars} ≠ {csv_days} days × {BARS_PER_DAY} bars")
-                csv_issues.append(symbol)
-
-            # Check each day has exactly 391 bars
-            csv_per_day = csv_df.groupby(csv_df.index.date).size()
-            csv_bad_days = [(str(d), int(c), csv_df[csv_df.index.date == d].index.min(), csv_df[csv_df.index.date == d].index.max())
-                           for d, c in csv_per_day.items() if c != BARS_PER_DAY]
-
-            if csv_bad_days:
-                all_errors.append(f"❌ {symbol} CSV: {len(csv_bad_days)} days with incorrect bar count:")
-                for date_str, count, first_time, last_time in csv_bad_days[:5]:  # Show first 5
-                    all_errors.append(f"   • {date_str}: {count} bars (expected {BARS_PER_DAY}) "
-                                    f"[{first_time.strftime('%H:%M:%S')} → {last_time.strftime('%H:%M:%S')}]")
-                if len(csv_bad_days) > 5:
-                    all_errors.append(f"   • ... and {len(csv_bad_days) - 5} more days")
-                csv_issues.append(symbol)
-
-            # === CHECK 2: Binary File Validation ===
-            if not bin_path.exists():
-                all_errors.append(f"❌ {symbol}: Binary file missing")
+            data_path = self._get_data_path(symbol, entries)
+            if data_path is not None and self._cached_stats(symbol, data_path,
+                                                            entries[data_path.name].stat()) is None:
+                scans += 1
+        if scans >= SANITY_POOL_MIN_SCANS:
+            workers = min(len(symbols), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_validate_one_symbol, [str(self.data_dir)] * len(symbols), symbols))
+        else:
+            results = [_validate_one_symbol(str(self.data_dir), symbol) for symbol in symbols]
+
+        manifest = self._load_manifest()
+        for result in results:
+            if result.manifest_entry is not None and manifest.get(result.symbol.upper()) != result.manifest_entry:
+                manifest[result.symbol.upper()] = result.manifest_entry
+                manifest_changed = True
+
+        for result in results:
+            symbol = result.symbol
+            all_errors.extend(result.errors)
+            if result.data_issue:
+                data_issues.append(symbol)
+            if result.bin_issue:
                 bin_issues.append(symbol)
-            else:
-                bin_df = self._read_binary_file(bin_path)
-                if bin_df is None:
-                    all_errors.append(f"❌ {symbol}: Binary file exists but is unreadable or corrupted")
-                    bin_issues.append(symbol)
-                else:
-                    # Check binary bar count alignment
-                    bin_bars = len(bin_df)
-                    bin_days = bin_bars // BARS_PER_DAY
-
-                    if bin_bars != bin_days * BARS_PER_DAY:
-                        all_errors.append(f"❌ {symbol} BIN: Total bars {bin_bars} ≠ {bin_days} days × {BARS_PER_DAY} bars")
-                        bin_issues.append(symbol)
-
-                    # Check each day has exactly 391 bars in binary
-                    bin_per_day = bin_df.groupby(bin_df.index.date).size()
-                    bin_bad_days = [(str(d), int(c), bin_df[bin_df.index.date == d].index.min(), bin_df[bin_df.index.date == d].index.max())
-                                   for d, c in bin_per_day.items() if c != BARS_PER_DAY]
-
-                    if bin_bad_days:
-                        all_errors.append(f"❌ {symbol} BIN: {len(bin_bad_days)} days with incorrect bar count:")
-                        for date_str, count, first_time, last_time in bin_bad_days[:5]:  # Show first 5
-                            all_errors.append(f"   • {date_str}: {count} bars (expected {BARS_PER_DAY}) "
-                                            f"[{first_time.strftime('%H:%M:%S')} → {last_time.strftime('%H:%M:%S')}]")
-                        if len(bin_bad_days) > 5:
-                            all_errors.append(f"   • ... and {len(bin_bad_days) - 5} more days")
-                        bin_issues.append(symbol)
-
-                    # === CHECK 3: CSV vs Binary Comparison ===
-                    if csv_bars != bin_bars:
-                        all_errors.append(f"❌ {symbol}: CSV/BIN bar count mismatch - CSV:{csv_bars} vs BIN:{bin_bars}")
-                        mismatch_issues.append(symbol)
-
-                    # Check date ranges match
-                    bin_date_range = self.get_date_range(bin_df)
-                    if csv_date_range != bin_date_range:
-                        all_errors.append(f"❌ {symbol}: CSV/BIN date range mismatch")
-                        all_errors.append(f"   • CSV: {csv_start} → {csv_end}")
-                        all_errors.append(f"   • BIN: {bin_date_range[0]} → {bin_date_range[1]}")
-                        mismatch_issues.append(symbol)
+            if result.mismatch_issue:
+                mismatch_issues.append(symbol)
+            if result.date_range is None:
+                continue
+            data_date_range = result.date_range
+            data_start, data_end = data_date_range
+            data_days = result.days
 
             # === CHECK 4: Cross-Symbol Date Range Consistency ===
             if reference_date_range is None:
-                reference_date_range = csv_date_range
-                reference_days = csv_days
+                reference_date_range = data_date_range
+                reference_days = data_days
             else:
-                if csv_date_range != reference_date_range:
+                if data_date_range != reference_date_range:
                     all_errors.append(f"❌ {symbol}: Date range differs from reference symbol")
-                    all_errors.append(f"   • {symbol}: {csv_start} → {csv_end} ({csv_days} days)")
+                    all_errors.append(f"   • {symbol}: {data_start} → {data_end} ({data_days} days)")
                     all_errors.append(f"   • Reference: {reference_date_range[0]} → {reference_date_range[1]} ({reference_days} days)")
 
+        if manifest_changed:
+            self._save_manifest()
+
         # === SUMMARY ===
         print(f"{'='*70}")
         print(f"  VALIDATION RESULTS")
@@ -595,12 +1191,12 @@ class MarketDataDB:
             print(f"\n{'='*70}")
             print(f"  ERROR SUMMARY")
             print(f"{'='*70}")
-            if csv_issues:
-                print(f"CSV Issues: {len(set(csv_issues))} symbols - {', '.join(sorted(set(csv_issues)))}")
+            if data_issues:
+                print(f"Data Issues: {len(data_issues)} symbols - {', '.join(data_issues)}")
             if bin_issues:
-                print(f"Binary Issues: {len(set(bin_issues))} symbols - {', '.join(sorted(set(bin_issues)))}")
+                print(f"Binary Issues: {len(bin_issues)} symbols - {', '.join(bin_issues)}")
             if mismatch_issues:
-                print(f"CSV/BIN Mismatch: {len(set(mismatch_issues))} symbols - {', '.join(sorted(set(mismatch_issues)))}")
+                print(f"DATA/BIN Mismatch: {len(mismatch_issues)} symbols - {', '.join(mismatch_issues)}")
             print(f"{'='*70}\n")
 
             return False
@@ -612,7 +1208,7 @@ class MarketDataDB:
             print(f"  • Trading days: {reference_days}")
             print(f"  • Bars per symbol: {reference_days * BARS_PER_DAY:,}")
             print(f"  • All days have exactly {BARS_PER_DAY} bars (09:30-16:00)")
-            print(f"  • CSV and binary files match perfectly")
+            print(f"  • Data and binary files match perfectly")
             print(f"\n{'='*70}\n")
 
             return True
@@ -625,10 +1221,9 @@ class MarketDataDB:
         min_date = None
         max_date = None
 
-        for symbol in symbols:
-            df = self.read_existing_data(symbol)
-            if df is not None and not df.empty:
-                symbol_range = self.get_date_range(df)
+        with self.manifest_batch():
+            for symbol in symbols:
+                symbol_range = self.get_stored_date_range(symbol)
                 if symbol_range:
                     if min_date is None or symbol_range[0] < min_date:
                         min_date = symbol_range[0]
@@ -698,23 +1293,20 @@ class MarketDataDB:
             print("ℹ️  No existing data found - will use requested range for all symbols")
             return None
 
-        start_date = global_range[0].strftime('%Y-%m-%d')
-        end_date = global_range[1].strftime('%Y-%m-%d')
+        start_date = global_range[0].isoformat()
+        end_date = global_range[1].isoformat()
 
         print(f"📊 Global date range detected: {start_date} to {end_date}")
         print(f"   Ensuring all {len(symbols)} symbols have this range...\n")
 
         # Step 2: Update each symbol to have the global range
+        misaligned = set(self.misaligned_symbols(symbols, global_range[0], global_range[1]))
         updated_count = 0
         for symbol in symbols:
-            existing_df = self.read_existing_data(symbol)
-
             # Check if symbol already has the full range
-            if existing_df is not None:
-                existing_range = self.get_date_range(existing_df)
-                if existing_range and existing_range[0] == global_range[0] and existing_range[1] == global_range[1]:
-                    print(f"✓ {symbol}: Already synchronized ({start_date} to {end_date})")
-                    continue
+            if symbol not in misaligned:
+                print(f"✓ {symbol}: Already synchronized ({start_date} to {end_date})")
+                continue
 
             # Symbol needs update
             if self.update_symbol(symbol, start_date, end_date, api_key):
@@ -728,6 +1320,127 @@ class MarketDataDB:
         return (start_date, end_date)
 
 
+@dataclass
+class ValidationResult:
+    """Outcome of sanity_check's per-symbol file checks (data, binary, data vs binary)."""
+    symbol: str
+    errors: List[str] = field(default_factory=list)
+    data_issue: bool = False
+    bin_issue: bool = False
+    mismatch_issue: bool = False
+    date_range: Optional[Tuple[date, date]] = None  # None if the data file is missing/unreadable
+    days: int = 0
+    manifest_entry: Optional[Dict] = None  # Scan result for the parent to cache
+
+
+def _validate_one_symbol(data_dir: str, symbol: str) -> ValidationResult:
+    """
+    Runs sanity_check's checks 1-3 for one symbol. Module-level so it can run in a
+    worker process; cross-symbol checks and printing stay in the parent.
+    """
+    db = MarketDataDB(data_dir)
+    result = ValidationResult(symbol)
+    data_path = db._get_data_path(symbol)
+    _, bin_path = db._get_file_paths(symbol)
+
+    # === CHECK 1: Data File Validation ===
+    if data_path is None:
+        result.errors.append(f"❌ {symbol}: Data file missing")
+        result.data_issue = True
+        return result
+
+    data_stats = db.scan_stats(symbol, persist=False)
+    if not data_stats or not data_stats['bars']:
+        result.errors.append(f"❌ {symbol}: Data file exists but is empty or unreadable")
+        result.data_issue = True
+        return result
+
+    # Check data date range
+    data_start = data_stats['start_date']
+    data_end = data_stats['end_date']
+    data_date_range = (data_start, data_end)
+
+    # Check data bar count alignment
+    data_bars = data_stats['bars']
+    data_days = data_stats['days']
+
+    result.date_range = data_date_range
+    result.days = data_days
+    result.manifest_entry = db._load_manifest().get(symbol.upper())
+
+    if data_bars != data_days * BARS_PER_DAY:
+        result.errors.append(f"❌ {symbol} DATA: Total bars {data_bars} ≠ {data_days} days × {BARS_PER_DAY} bars")
+        result.data_issue = True
+
+    # Check each day has exactly 391 bars
+    data_bad_days = data_stats['bad_days']
+
+    if data_bad_days:
+        result.errors.append(f"❌ {symbol} DATA: {len(data_bad_days)} days with incorrect bar count:")
+        for date_str, count, first_epoch, last_epoch in data_bad_days[:5]:  # Show first 5
+            result.errors.append(f"   • {date_str}: {count} bars (expected {BARS_PER_DAY}) "
+                                 f"[{_et_clock(first_epoch)} → {_et_clock(last_epoch)}]")
+        if len(data_bad_days) > 5:
+            result.errors.append(f"   • ... and {len(data_bad_days) - 5} more days")
+        result.data_issue = True
+
+    # === CHECK 2: Binary File Validation ===
+    if not bin_path.exists():
+        result.errors.append(f"❌ {symbol}: Binary file missing")
+        result.bin_issue = True
+    else:
+        bin_stats = db.scan_bin_stats(symbol)
+        if bin_stats is None:
+            result.errors.append(f"❌ {symbol}: Binary file exists but is unreadable or corrupted")
+            result.bin_issue = True
+        else:
+            # Check binary bar count alignment
+            bin_bars = bin_stats['bars']
+            bin_days = bin_bars // BARS_PER_DAY
+
+            if bin_bars != bin_days * BARS_PER_DAY:
+                result.errors.append(f"❌ {symbol} BIN: Total bars {bin_bars} ≠ {bin_days} days × {BARS_PER_DAY} bars")
+                result.bin_issue = True
+
+            # Check each day has exactly 391 bars in binary
+            bin_bad_days = bin_stats['bad_days']
+
+            if bin_bad_days:
+                result.errors.append(f"❌ {symbol} BIN: {len(bin_bad_days)} days with incorrect bar count:")
+                for date_str, count, first_epoch, last_epoch in bin_bad_days[:5]:  # Show first 5
+                    result.errors.append(f"   • {date_str}: {count} bars (expected {BARS_PER_DAY}) "
+                                         f"[{_et_clock(first_epoch)} → {_et_clock(last_epoch)}]")
+                if len(bin_bad_days) > 5:
+                    result.errors.append(f"   • ... and {len(bin_bad_days) - 5} more days")
+                result.bin_issue = True
+
+            # === CHECK 3: Data vs Binary Comparison ===
+            if data_bars != bin_bars:
+                result.errors.append(f"❌ {symbol}: DATA/BIN bar count mismatch - DATA:{data_bars} vs BIN:{bin_bars}")
+                result.mismatch_issue = True
+
+            # Check date ranges match
+            bin_date_range = (bin_stats['start_date'], bin_stats['end_date'])
+            if data_date_range != bin_date_range:
+                result.errors.append(f"❌ {symbol}: DATA/BIN date range mismatch")
+                result.errors.append(f"   • DATA: {data_start} → {data_end}")
+                result.errors.append(f"   • BIN: {bin_date_range[0]} → {bin_date_range[1]}")
+                result.mismatch_issue = True
+
+    return result
+
+
+def list_available_dates(data_dir: str = "data/equities") -> List[str]:
+    """
+    Returns all trading days in the database (YYYY-MM-DD, ascending).
+    Importable entry point for in-process callers such as the monitor webapp; read-only,
+    so a missing data_dir yields [] instead of being created by MarketDataDB().
+    """
+    if not Path(data_dir).is_dir():
+        return []
+    return MarketDataDB(data_dir).list_trading_days()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Market Data Manager - Append-only historical market data database",
@@ -737,8 +1450,12 @@ def main():
 
     # Data update commands
     parser.add_argument('--symbols', nargs='+', help="Symbols to update (e.g., TQQQ SQQQ)")
-    parser.add_argument('--start', help="Start date (MM-DD, year is fixed to 2025)")
-    parser.add_argument('--end', help="End date (MM-DD, year is fixed to 2025)")
+    parser.add_argument('--start', help="Start date (YYYY-MM-DD, or MM-DD for the current year)")
+    parser.add_argument('--end', help="End date (YYYY-MM-DD, or MM-DD for the current year)")
+    parser.add_argument('--workers', type=int, default=UPDATE_WORKERS,
+                       help=f"Symbols to update concurrently (default {UPDATE_WORKERS}); they share the --fetch-workers request slots")
+    parser.add_argument('--fetch-workers', type=int, default=FETCH_WORKERS,
+                       help=f"Polygon requests in flight across all symbols (default {FETCH_WORKERS}; keep within your Polygon rate limit)")
     # Data directory is fixed to data/equities to avoid duplication and confusion
 
     # Sync commands
@@ -762,36 +1479,42 @@ def main():
     parser.add_argument('--symbols-sync', action='store_true',
                        help="Sync data/equities with config/symbols.conf: add missing symbols, ensure equal date range and 391 bars/day, and remove extraneous symbols not in symbols.conf")
 
+    parser.add_argument('--dry-run', action='store_true',
+                       help="With --symbols-sync: only report the planned removals and updates (no deletes, no Polygon calls)")
+
     # Sanity check
     parser.add_argument('--sanity-check', action='store_true',
-                       help="Comprehensive data validation: check that all symbols have the same date range, exactly 391 bars per day, and verify both CSV and binary files match")
+                       help="Comprehensive data validation: check that all symbols have the same date range, exactly 391 bars per day, and verify both data and binary files match")
+
+    # Storage migration
+    parser.add_argument('--migrate-parquet', action='store_true',
+                       help="Convert legacy CSV files in data/equities to Parquet")
 
     args = parser.parse_args()
 
-    # Convert MM-DD dates to YYYY-MM-DD (prepend "2025-")
-    if args.start:
-        if len(args.start) == 5 and args.start[2] == '-':
-            args.start = "2025-" + args.start
-    if args.end:
-        if len(args.end) == 5 and args.end[2] == '-':
-            args.end = "2025-" + args.end
+    # Convert MM-DD dates to YYYY-MM-DD (current year)
+    args.start = _expand_mm_dd(args.start)
+    args.end = _expand_mm_dd(args.end)
+    # Upper-case and dedupe --symbols: concurrent updates of one symbol would write the same files
+    if args.symbols:
+        args.symbols = list(dict.fromkeys(s.upper() for s in args.symbols))
 
     # Initialize database (fixed root)
-    db = MarketDataDB("data/equities")
+    db = MarketDataDB("data/equities", fetch_workers=args.fetch_workers)
 
     # Helper: load symbols from config/symbols.conf (single source of truth)
     def load_symbols_from_conf() -> List[str]:
         conf_path = Path('config/symbols.conf')
-        if not conf_path.exists():
+        try:
+            mtime_ns = conf_path.stat().st_mtime_ns
+        except OSError:
             return []
-        syms: List[str] = []
-        for line in conf_path.read_text().splitlines():
-            s = line.strip()
-            if not s or s.startswith('#'):
-                continue
-            syms.append(s.upper())
-        # Deduplicate, keep order stable-ish
-        return sorted(set(syms))
+        return list(_parse_symbols_conf(str(conf_path), mtime_ns))
+
+    if args.migrate_parquet:
+        converted = db.migrate_to_parquet()
+        print(f"✓ Migrated {converted} symbols to Parquet")
+        return
 
     # Handle sanity check
     if args.sanity_check:
@@ -811,19 +1534,19 @@ def main():
         return
 
     if args.list_dates:
-        trading_days = db.list_trading_days()
+        trading_days = list_available_dates("data/equities")
         if not trading_days:
             print("No trading days found in database", flush=True)
             return
         # Output one date per line (for easy parsing by webapp)
-        for date in trading_days:
-            print(date, flush=True)
+        for day in trading_days:
+            print(day, flush=True)
         return
 
     # Handle symbols-sync
     if args.symbols_sync:
         api_key = os.getenv('POLYGON_API_KEY')
-        if not api_key:
+        if not api_key and not args.dry_run:
             print("❌ Error: POLYGON_API_KEY environment variable not set")
             return
 
@@ -832,12 +1555,7 @@ def main():
         if not conf_path.exists():
             print("❌ Error: config/symbols.conf not found")
             return
-        desired = []
-        for line in conf_path.read_text().splitlines():
-            s = line.strip()
-            if not s or s.startswith('#'): continue
-            desired.append(s.upper())
-        desired = sorted(set(desired))
+        desired = load_symbols_from_conf()
         print(f"🔧 symbols-sync: target set from symbols.conf → {len(desired)} symbols")
 
         # Existing symbols in data dir
@@ -845,48 +1563,61 @@ def main():
 
         # Remove extraneous symbols not in symbols.conf
         extraneous = existing - set(desired)
-        for sym in sorted(extraneous):
-            csv_path, bin_path = db._get_file_paths(sym)
-            try:
-                if csv_path.exists(): csv_path.unlink()
-                if bin_path.exists(): bin_path.unlink()
-                print(f"🗑 Removed extraneous: {sym}")
-            except Exception as e:
-                print(f"⚠ Could not remove {sym}: {e}")
+        if args.dry_run:
+            for sym in sorted(extraneous):
+                print(f"🗑 Would remove extraneous: {sym}")
+        else:
+            for sym, error in db.remove_symbols(sorted(extraneous)).items():
+                if error is None:
+                    print(f"🗑 Removed extraneous: {sym}")
+                else:
+                    print(f"⚠ Could not remove {sym}: {error}")
+
+        # Symbols on disk after the removals; kept current as symbols are added below
+        current = existing - extraneous
 
         # Add/update missing symbols
         # Find global range from any remaining symbol; if none exist, use a default range (last 30 NYSE sessions)
-        remaining = [s for s in desired if s in db.list_all_symbols()]
+        remaining = [s for s in desired if s in current]
         global_range = db.get_global_date_range(remaining) if remaining else None
         if global_range is None:
             # Build a default recent range
-            end = datetime.now().date()
-            start = end - timedelta(days=45)
-            start_date = start.strftime('%Y-%m-%d')
-            end_date = end.strftime('%Y-%m-%d')
-            print(f"ℹ️ No existing symbols to infer range; using default {start_date} to {end_date}")
+            end_dt = datetime.now().date()
+            start_dt = end_dt - timedelta(days=45)
+            print(f"ℹ️ No existing symbols to infer range; using default {start_dt} to {end_dt}")
         else:
-            start_date = global_range[0].strftime('%Y-%m-%d')
-            end_date = global_range[1].strftime('%Y-%m-%d')
-            print(f"📊 Using global range {start_date} to {end_date}")
-
-        # Ensure each desired symbol exists and is aligned
-        for sym in desired:
-            if sym not in db.list_all_symbols():
+            start_dt, end_dt = global_range
+            print(f"📊 Using global range {start_dt} to {end_dt}")
+        # Ranges are compared as dates; update_symbol takes YYYY-MM-DD strings
+        start_date, end_date = start_dt.isoformat(), end_dt.isoformat()
+
+        # Symbols already covering exactly the target range need no update
+        misaligned = db.misaligned_symbols(desired, start_dt, end_dt)
+        if len(misaligned) < len(desired):
+            print(f"↷ {len(desired) - len(misaligned)}/{len(desired)} symbols already aligned; skipping")
+
+        # Add missing symbols and realign the rest (independent, network-bound updates)
+        def ensure_symbol(sym: str) -> bool:
+            if sym not in current:
                 print(f"➕ Adding missing symbol {sym}")
-                db.update_symbol(sym, start_date, end_date, api_key)
-            else:
-                # Ensure alignment and full bars
-                df = db.read_existing_data(sym)
-                if df is None or df.empty:
-                    db.update_symbol(sym, start_date, end_date, api_key)
-                else:
-                    rng = db.get_date_range(df)
-                    if not rng or rng[0].strftime('%Y-%m-%d') != start_date or rng[1].strftime('%Y-%m-%d') != end_date:
-                        db.update_symbol(sym, start_date, end_date, api_key)
+            return db.update_symbol(sym, start_date, end_date, api_key)
+
+        if args.dry_run:
+            for sym in misaligned:
+                action = "update to range" if sym in current else "add"
+                print(f"➕ Would {action} {sym} ({start_date} to {end_date})")
+            print(f"✅ symbols-sync dry run: {len(extraneous)} to remove, {len(misaligned)} to add/update")
+            return
+
+        if misaligned:
+            with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(misaligned)))) as pool:
+                for sym, ok in zip(misaligned, pool.map(ensure_symbol, misaligned)):
+                    if ok:
+                        current.add(sym)
+
+            # Final sync to ensure exact range and integrity across all desired symbols
+            db.sync_all_symbols(desired, api_key)
 
-        # Final sync to ensure exact range and integrity across all desired symbols
-        db.sync_all_symbols(desired, api_key)
         db.verify_integrity(desired)
         print("✅ symbols-sync complete")
         return
@@ -900,56 +1631,59 @@ def main():
                 print("❌ Error: No symbols provided and config/symbols.conf is missing or empty")
                 return
 
-        print(f"\n📊 Database Status")
-        print(f"{'='*70}")
+        # Collected and written at once: one write instead of several per symbol
+        out: List[str] = []
+        emit = out.append
+        emit(f"\n📊 Database Status\n")
+        emit(f"{'='*70}\n")
+        entries = db._scan_dir()
         for symbol in symbols:
-            status = db.get_status(symbol)
+            status = db.get_status(symbol, entries)
             if status['exists']:
-                print(f"  {symbol}:")
-                print(f"    Range: {status['start_date']} to {status['end_date']}")
-                print(f"    Bars:  {status['bars']:,} ({status['days']} days)")
-                print(f"    Size:  CSV={status['csv_size_kb']} KB, BIN={status['bin_size_kb']} KB")
+                emit(f"  {symbol}:\n")
+                emit(f"    Range: {status['start_date']} to {status['end_date']}\n")
+                emit(f"    Bars:  {status['bars']:,} ({status['days']} days)\n")
+                emit(f"    Size:  DATA={status['data_size_kb']} KB, BIN={status['bin_size_kb']} KB\n")
             else:
-                print(f"  {symbol}: (no data)")
-        print(f"{'='*70}\n")
+                emit(f"  {symbol}: (no data)\n")
+        emit(f"{'='*70}\n\n")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
         return
 
     # Show summary for all symbols
     if args.show:
-        symbols = db.list_all_symbols()
-        print(f"\n📚 Market Data Summary (data/equities)")
-        print(f"{'='*70}")
+        entries = db._scan_dir()
+        symbols = db.list_all_symbols(entries)
+        out: List[str] = []
+        emit = out.append
+        emit(f"\n📚 Market Data Summary (data/equities)\n")
+        emit(f"{'='*70}\n")
         if not symbols:
-            print("  (empty)")
+            emit("  (empty)\n")
         else:
-            for symbol in symbols:
-                st = db.get_status(symbol)
-                if st['exists']:
-                    days = st['days']
-                    bars = st['bars']
-                    start = st['start_date']
-                    end = st['end_date']
-                    print(f"  {symbol}: {bars:,} bars ({days} days) | {start} → {end}")
-                    # Per-day bar count validation (expect exactly 391)
-                    try:
-                        df = db.read_existing_data(symbol)
-                        if df is not None and not df.empty:
-                            per_day = df.groupby(df.index.date).size()
-                            bad = [(str(d), int(c)) for d, c in per_day.items() if c != BARS_PER_DAY]
-                            if bad:
-                                print(f"    ⚠ Days with incorrect bar count (expected {BARS_PER_DAY}):")
-                                # Print up to first 10 for brevity
-                                for d, c in bad[:10]:
-                                    print(f"      {d}: {c} bars")
-                                if len(bad) > 10:
-                                    print(f"      ... and {len(bad)-10} more")
-                            else:
-                                print(f"    ✓ All days have exactly {BARS_PER_DAY} bars")
-                    except Exception as e:
-                        print(f"    ⚠ Could not verify per-day bars: {e}")
-                else:
-                    print(f"  {symbol}: (no data)")
-        print(f"{'='*70}\n")
+            with db.manifest_batch():
+                for symbol in symbols:
+                    # Counts, range and bad days come from the manifest; only changed files are rescanned
+                    st = db.scan_stats(symbol, entries=entries)
+                    if st is not None:
+                        emit(f"  {symbol}: {st['bars']:,} bars ({st['days']} days) | {st['start_date']} → {st['end_date']}\n")
+                        # Per-day bar count validation (expect exactly 391)
+                        bad = st['bad_days']
+                        if bad:
+                            emit(f"    ⚠ Days with incorrect bar count (expected {BARS_PER_DAY}):\n")
+                            # Print up to first 10 for brevity
+                            for d, c, _, _ in bad[:10]:
+                                emit(f"      {d}: {c} bars\n")
+                            if len(bad) > 10:
+                                emit(f"      ... and {len(bad)-10} more\n")
+                        elif st['bars']:
+                            emit(f"    ✓ All days have exactly {BARS_PER_DAY} bars\n")
+                    else:
+                        emit(f"  {symbol}: (no data)\n")
+        emit(f"{'='*70}\n\n")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
         return
 
     # Handle sync-only command
@@ -986,19 +1720,36 @@ def main():
         print("❌ Error: No symbols provided and config/symbols.conf is missing or empty")
         return
 
-    # Update each symbol
-    success_count = 0
+    try:
+        start_dt, end_dt = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    except ValueError:
+        print("❌ Error: --start/--end must be YYYY-MM-DD or MM-DD")
+        return
+
+    # Symbols already holding every session of a closed range need no Polygon call
+    to_fetch = db.symbols_to_fetch(symbols_for_update, start_dt, end_dt)
+    pending = set(to_fetch)
     for symbol in symbols_for_update:
-        if db.update_symbol(symbol, args.start, args.end, api_key):
-            success_count += 1
+        if symbol not in pending:
+            print(f"✓ {symbol}: up to date ({start_dt} to {end_dt})")
+
+    # Update symbols concurrently: each update is dominated by Polygon round trips
+    def update(symbol: str) -> bool:
+        return db.update_symbol(symbol, args.start, args.end, api_key)
+
+    fetched_count = 0
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(to_fetch)))) as pool:
+            fetched_count = sum(bool(ok) for ok in pool.map(update, to_fetch))
+    success_count = fetched_count + len(symbols_for_update) - len(to_fetch)
 
     # Summary
     print(f"\n{'='*70}")
     print(f"  Update Summary: {success_count}/{len(symbols_for_update)} symbols successful")
     print(f"{'='*70}\n")
 
-    # Automatic sync of all symbols unless skipped
-    if success_count > 0 and not args.no_sync:
+    # Automatic sync of all symbols unless skipped (or nothing new was stored)
+    if fetched_count > 0 and not args.no_sync:
         all_symbols = db.list_all_symbols()
         if all_symbols:
             db.sync_all_symbols(all_symbols, api_key)